@@ -6,7 +6,7 @@ from datetime import datetime
 import openai
 from dotenv import load_dotenv
 from NameResolver import NameResolver
-from db_connector import get_identity_analyses
+from db_connector import get_identity_summaries
 
 
 # Load environment variables from .env file (if it exists)
@@ -28,8 +28,8 @@ class BioGenerator:
     def load_data(self, face_id):
         """Load identity analyses data from the database"""
         try:
-            from db_connector import get_identity_analyses
-            identity_analyses = get_identity_analyses(face_id)
+            from db_connector import get_identity_summaries
+            identity_analyses = get_identity_summaries(face_id)
             
             if not identity_analyses:
                 raise ValueError(f"No identity analyses found for face ID: {face_id}")
@@ -586,10 +586,10 @@ class BioGenerator:
         
         try:
             # Import database functions
-            from db_connector import get_identity_analyses, get_record_analyses, save_bio
+            from db_connector import get_identity_summaries, get_record_analyses, save_bio
             
             # Get identity analyses from database
-            identity_analyses = get_identity_analyses(face_id)
+            identity_analyses = get_identity_summaries(face_id)
             if not identity_analyses:
                 print(f"[BIOGEN] No identity analyses found for face ID: {face_id}")
                 return None
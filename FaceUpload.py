@@ -2,17 +2,23 @@ import os
 import time
 import json
 import base64
-import requests
 import argparse
 import glob
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import urllib.parse
+import random
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from dotenv import load_dotenv
 import openai
 import traceback
 
+from metrics import Histogram
+from http_client import get_client as get_http_client
+import scrape_cache
 
 try:
     import db_connector
@@ -36,6 +42,28 @@ except ImportError:
 TESTING_MODE = False  # Set to False for production use
 APITOKEN = os.getenv('FACECHECK_API_TOKEN')
 
+# Pooled HTTP sessions for FaceCheckID and Zyte; the controller injects its configured client
+HTTP_CLIENT = get_http_client()
+
+# FaceCheckID search polling: the wait between polls starts at the minimum,
+# doubles while the reported progress stalls, and is randomized by +/- the
+# jitter fraction so concurrent searches don't poll in lockstep
+POLL_MIN_SECONDS = float(os.getenv('FACECHECK_POLL_MIN_SECONDS', '1'))
+POLL_MAX_SECONDS = float(os.getenv('FACECHECK_POLL_MAX_SECONDS', '10'))
+POLL_JITTER = float(os.getenv('FACECHECK_POLL_JITTER', '0.2'))
+
+# Scraping of the top search results: how many run at once per face, and how
+# long a face waits for them before saving whatever has finished
+SCRAPE_TOP_RESULTS = 5
+SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', '5'))
+SCRAPE_DEADLINE_SECONDS = float(os.getenv('SCRAPE_DEADLINE_SECONDS', '120'))
+# Most distinct URLs scraped per face, primaries and fallbacks together
+SCRAPE_MAX_PER_FACE = int(os.getenv('SCRAPE_MAX_PER_FACE', '10'))
+
+# Per-search polling metrics
+search_polls = Histogram(buckets=(1, 2, 5, 10, 20, 50, 100, 200))
+search_wait_seconds = Histogram(buckets=(1, 5, 10, 30, 60, 120, 300, 600))
+
 # Firecrawl API Configuration
 FIRECRAWL_API_KEY = os.getenv('FIRECRAWL_API_KEY')
 
@@ -59,33 +87,95 @@ def setup_directories():
         print(f"Created faces input directory: {DEFAULT_FACES_DIR}")
     return None
 
-def load_processed_faces():
-    """Load the list of already processed face files from database only"""
-    from db_connector import load_processed_faces as db_load_processed_faces
-    return db_load_processed_faces()
+def face_id_for_file(image_file):
+    """Get the face ID for a face image file (its basename without extension)"""
+    return os.path.splitext(os.path.basename(image_file))[0]
 
-def save_processed_faces(processed_faces):
-    """This function is now a no-op as the database tracks processed faces"""
-    pass
-        
+def is_processed(face_ids):
+    """Get the subset of face IDs that already have results in the database"""
+    from db_connector import is_processed as db_is_processed
+    return db_is_processed(face_ids)
 
-def get_unprocessed_faces(faces_dir, processed_faces):
+def get_unprocessed_faces(faces_dir, force=False):
     """Get list of face image files that haven't been processed yet"""
     # Get all image files in the faces directory
     image_files = glob.glob(os.path.join(faces_dir, "face_*.jpg"))
+    if force or not image_files:
+        return image_files
     
-    # Filter out already processed files
-    unprocessed = [file for file in image_files if file not in processed_faces]
-    
-    return unprocessed
+    # Filter out files whose face IDs already have results
+    processed = is_processed([face_id_for_file(file) for file in image_files])
+    return [file for file in image_files if face_id_for_file(file) not in processed]
 
-def search_by_face(image_file, timeout=300):
+def search_by_face(image_file, timeout=300, progress_callback=None):
     """
     Search FaceCheckID API using a face image
     
     Args:
         image_file: Path to the image file
         timeout: Maximum time in seconds to wait for search (default: 5 minutes)
+        progress_callback: Optional callable invoked with (progress, message) whenever
+            the search progress percentage changes
+    
+    Returns:
+        Tuple of (error_message, search_results)
+    """
+    try:
+        with open(image_file, 'rb') as img_file:
+            image_data = img_file.read()
+    except Exception as e:
+        return f"Error uploading image: {str(e)}", None
+    
+    return search_by_face_data(image_data, os.path.basename(image_file), timeout, progress_callback)
+
+def next_poll_delay(delay, progress, last_progress):
+    """
+    Work out how long to wait before polling a FaceCheckID search again
+    
+    The delay drops back to the minimum whenever progress moves and doubles
+    (up to the maximum) while it doesn't. Near the end of a search it stays
+    short so the results are picked up promptly.
+    
+    Args:
+        delay: Previous delay in seconds (None before the first poll)
+        progress: Progress percentage from the latest poll
+        last_progress: Progress percentage from the poll before it
+        
+    Returns:
+        Seconds to sleep, with jitter applied
+    """
+    if delay is None or progress != last_progress:
+        delay = POLL_MIN_SECONDS
+    else:
+        delay = min(delay * 2, POLL_MAX_SECONDS)
+    
+    if progress >= 90:
+        delay = min(delay, POLL_MIN_SECONDS * 2)
+    
+    return delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+def get_search_poll_metrics():
+    """
+    Get polling metrics for FaceCheckID searches
+    
+    Returns:
+        Dictionary with histograms of polls and seconds spent waiting per search
+    """
+    return {
+        "polls_per_search": search_polls.snapshot(),
+        "wait_seconds_per_search": search_wait_seconds.snapshot()
+    }
+
+def search_by_face_data(image_data, filename="face.jpg", timeout=300, progress_callback=None):
+    """
+    Search FaceCheckID API using in-memory image bytes
+    
+    Args:
+        image_data: Image bytes
+        filename: File name sent with the multipart upload
+        timeout: Maximum time in seconds to wait for search (default: 5 minutes)
+        progress_callback: Optional callable invoked with (progress, message) whenever
+            the search progress percentage changes
     
     Returns:
         Tuple of (error_message, search_results)
@@ -98,9 +188,8 @@ def search_by_face(image_file, timeout=300):
     
     # Step 1: Upload the image
     try:
-        with open(image_file, 'rb') as img_file:
-            files = {'images': img_file, 'id_search': None}
-            response = requests.post(site + '/api/upload_pic', headers=headers, files=files).json()
+        files = {'images': (filename, image_data), 'id_search': None}
+        response = HTTP_CLIENT.post(site + '/api/upload_pic', headers=headers, files=files).json()
     except Exception as e:
         return f"Error uploading image: {str(e)}", None
     
@@ -121,29 +210,48 @@ def search_by_face(image_file, timeout=300):
     
     start_time = time.time()
     last_progress = -1
+    delay = None
+    polls = 0
+    waited = 0.0
     
-    while True:
-        # Check if timeout exceeded
-        if time.time() - start_time > timeout:
-            return f"Search timed out after {timeout} seconds", None
-        
-        try:
-            response = requests.post(site + '/api/search', headers=headers, json=json_data).json()
-        except Exception as e:
-            return f"Error during search: {str(e)}", None
-        
-        if response.get('error'):
-            return f"{response['error']} ({response['code']})", None
-        
-        if response.get('output'):
-            return None, response['output']['items']
-        
-        # Only print progress if it's changed
-        current_progress = response.get('progress', 0)
-        if current_progress != last_progress:
-            print(f"{response['message']} progress: {current_progress}%")
-            last_progress = current_progress
-        
+    try:
+        while True:
+            try:
+                polls += 1
+                response = HTTP_CLIENT.post(site + '/api/search', headers=headers, json=json_data).json()
+            except Exception as e:
+                return f"Error during search: {str(e)}", None
+            
+            if response.get('error'):
+                return f"{response['error']} ({response['code']})", None
+            
+            if response.get('output'):
+                print(f"Search finished after {polls} polls ({waited:.1f}s waiting between polls)")
+                return None, response['output']['items']
+            
+            current_progress = response.get('progress') or 0
+            delay = next_poll_delay(delay, current_progress, last_progress)
+            
+            # Only print progress if it's changed
+            if current_progress != last_progress:
+                print(f"{response['message']} progress: {current_progress}%")
+                last_progress = current_progress
+                if progress_callback:
+                    try:
+                        progress_callback(current_progress, response.get('message'))
+                    except Exception as e:
+                        print(f"Error in search progress callback: {e}")
+            
+            # Check if timeout exceeded, otherwise wait (never past the deadline) before polling again
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                return f"Search timed out after {timeout} seconds", None
+            sleep_time = min(delay, remaining)
+            time.sleep(sleep_time)
+            waited += sleep_time
+    finally:
+        search_polls.observe(polls)
+        search_wait_seconds.observe(waited)
 
 def save_thumbnail_from_base64(base64_str, filename):
     """Save Base64 encoded image to file"""
@@ -200,6 +308,13 @@ def scrape_with_zyte(url: str) -> Optional[Dict[str, Any]]:
         print(f"Zyte API key not set. Cannot scrape social media profile: {url}")
         return None
     
+    # Results are cached by profile URL, so repeat URLs don't cost another Zyte call
+    return scrape_cache.get_cache().fetch(
+        scrape_cache.SOURCE_ZYTE, scrape_url_key(url), lambda: _fetch_with_zyte(url)
+    )
+
+def _fetch_with_zyte(url: str) -> Optional[Dict[str, Any]]:
+    """Scrape a social media URL with the Zyte API, bypassing the scrape cache (see scrape_with_zyte)"""
     try:
         # Normalize URL to profile URL (remove post paths, etc.)
         original_url = url
@@ -211,7 +326,7 @@ def scrape_with_zyte(url: str) -> Optional[Dict[str, Any]]:
         print(f"Scraping social media profile with Zyte API: {normalized_url}")
         
         # Make request to Zyte API
-        api_response = requests.post(
+        api_response = HTTP_CLIENT.post(
             "https://api.zyte.com/v1/extract",
             auth=(ZYTE_API_KEY, ""),
             json={
@@ -353,32 +468,41 @@ def is_social_media_url(url: str) -> bool:
     # Social platforms Zyte handles well (excluding LinkedIn)
     return any(platform in domain for platform in ['instagram.com', 'twitter.com', 'x.com', 'facebook.com'])
 
-def scrape_with_firecrawl(url: str, fallback_urls: List[str] = None) -> Optional[Dict[str, Any]]:
+def past_deadline(deadline: Optional[float], url: str) -> bool:
+    """Return True (and say so) if a time.monotonic() deadline has passed, so url isn't fetched"""
+    if deadline is None or time.monotonic() < deadline:
+        return False
+    print(f"Scraping deadline passed, not fetching {url}")
+    return True
+
+def scrape_url(url: str, deadline: Optional[float] = None) -> Optional[Dict[str, Any]]:
     """
-    Scrape a URL using Firecrawl to extract information about the person.
-    If the URL is for a social media platform that Zyte handles better, use Zyte instead.
-    If scraping fails and fallback_urls are provided, attempts to scrape those.
+    Scrape a single URL for information about the person, without fallbacks.
+    LinkedIn profiles get LLM name extraction, social media URLs that Zyte
+    handles better go to Zyte first, and everything else goes to Firecrawl.
     
     Args:
-        url: The primary URL to scrape
-        fallback_urls: A list of alternative URLs to try if the primary fails
+        url: The URL to scrape
+        deadline: Optional time.monotonic() value after which no further paid
+            request (LLM, Zyte or Firecrawl) is started
         
     Returns:
-        Dictionary containing the scraped information or None if all scraping failed
+        Dictionary containing the scraped information or None if scraping failed
     """
+    # Skip empty or invalid URLs
+    if not url or not url.startswith(('http://', 'https://')):
+        return None
+    if past_deadline(deadline, url):
+        return None
     
-
     if "linkedin.com/in/" in url.lower():
         print(f"Detected LinkedIn URL: {url} - attempting LLM name extraction")
         linkedin_data = extract_name_from_linkedin_url(url)
         if linkedin_data:
             print(f"Successfully extracted name via LLM from LinkedIn URL")
             return linkedin_data
-        print("LinkedIn URL name extraction failed, continuing with other methods")
-    
-    # If URL is LinkedIn but LLM extraction failed, don't try to scrape with Firecrawl
-    if "linkedin.com/in/" in url.lower():
-        print(f"Skipping Firecrawl scraping for LinkedIn URL: {url}")
+        # If URL is LinkedIn but LLM extraction failed, don't try to scrape with Firecrawl
+        print(f"LinkedIn URL name extraction failed, skipping Firecrawl scraping for LinkedIn URL: {url}")
         return None
 
     # Normalize social media URLs first
@@ -386,20 +510,7 @@ def scrape_with_firecrawl(url: str, fallback_urls: List[str] = None) -> Optional
     if is_social_media_url(url):
         url = normalize_social_media_url(url)
         if url != original_url:
-            print(f"Normalized primary URL: {original_url} → {url}")
-    
-    # Normalize fallback URLs if they're social media
-    normalized_fallbacks = []
-    if fallback_urls:
-        for fallback_url in fallback_urls:
-            if is_social_media_url(fallback_url):
-                normalized = normalize_social_media_url(fallback_url)
-                if normalized != fallback_url:
-                    print(f"Normalized fallback URL: {fallback_url} → {normalized}")
-                normalized_fallbacks.append(normalized)
-            else:
-                normalized_fallbacks.append(fallback_url)
-        fallback_urls = normalized_fallbacks
+            print(f"Normalized URL: {original_url} → {url}")
             
     # Check if this is a social media URL that Zyte can handle better
     if is_social_media_url(url) and ZYTE_AVAILABLE:
@@ -408,11 +519,11 @@ def scrape_with_firecrawl(url: str, fallback_urls: List[str] = None) -> Optional
         if zyte_result:
             return zyte_result
         print("Zyte scraping failed, falling back to Firecrawl")
+        if past_deadline(deadline, url):
+            return None
         
     
     # If not a social media URL or Zyte failed, proceed with Firecrawl
-    global FIRECRAWL_AVAILABLE
-    
     if not FIRECRAWL_AVAILABLE:
         print("Firecrawl not available. Skipping web scraping.")
         return None
@@ -422,85 +533,214 @@ def scrape_with_firecrawl(url: str, fallback_urls: List[str] = None) -> Optional
         print("Firecrawl API key not set. Skipping web scraping.")
         return None
     
-    # Initialize a list of URLs to try, starting with the primary URL
-    urls_to_try = [url]
-    
-    # Add any fallback URLs if provided
-    if fallback_urls:
-        urls_to_try.extend(fallback_urls)
-    
-    # Try each URL in sequence until one succeeds
-    for current_url in urls_to_try:
-        try:
-            # Skip empty or invalid URLs
-            if not current_url or not current_url.startswith(('http://', 'https://')):
-                continue
-                
-            # Check if this fallback URL is a social media URL that Zyte can handle
-            # (We already normalized the URL earlier, so we can use it directly)
-            if current_url != url and is_social_media_url(current_url) and ZYTE_AVAILABLE:
-                print(f"Trying fallback social media URL with Zyte: {current_url}")
-                zyte_result = scrape_with_zyte(current_url)
-                if zyte_result:
-                    return zyte_result
-                print(f"Zyte failed for fallback URL, trying Firecrawl")
-                
-            print(f"Scraping {current_url} with Firecrawl...")
-            
-            # Initialize Firecrawl
-            firecrawl_app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
-            
-            # Define the extraction prompt rather than using a schema
-            # This approach is more flexible and works better with Firecrawl
-            extraction_prompt = """
-            Extract the following information about the person featured in this page:
-            - Full name of the person
-            - Description or bio
-            - Job, role, or occupation
-            - Location information
-            - Social media handles or usernames
-            - Age or birthdate information
-            - Organizations or companies they're affiliated with
-            
-            IMPORTANT: Also include the entire article or page content in a field called "full_content" - this should contain all the textual information from the page that could be relevant to the person.
-            
-            If the page is a social media profile, extract the profile owner's information.
-            If the page is a news article or blog post, extract information about the main person featured AND include the full article text.
-            If certain information isn't available, that's okay.
+    # Results are cached by normalized URL, so repeat URLs don't cost another Firecrawl call
+    if past_deadline(deadline, url):
+        return None
+    return scrape_cache.get_cache().fetch(
+        scrape_cache.SOURCE_FIRECRAWL, scrape_url_key(url), lambda: _fetch_with_firecrawl(url)
+    )
+
+def _fetch_with_firecrawl(url: str) -> Optional[Dict[str, Any]]:
+    """Scrape a URL with Firecrawl's prompt-based extraction, bypassing the scrape cache"""
+    try:
+        print(f"Scraping {url} with Firecrawl...")
+        
+        # Initialize Firecrawl
+        firecrawl_app = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
+        
+        # Define the extraction prompt rather than using a schema
+        # This approach is more flexible and works better with Firecrawl
+        extraction_prompt = """
+        Extract the following information about the person featured in this page:
+        - Full name of the person
+        - Description or bio
+        - Job, role, or occupation
+        - Location information
+        - Social media handles or usernames
+        - Age or birthdate information
+        - Organizations or companies they're affiliated with
+        
+        IMPORTANT: Also include the entire article or page content in a field called "full_content" - this should contain all the textual information from the page that could be relevant to the person.
+        
+        If the page is a social media profile, extract the profile owner's information.
+        If the page is a news article or blog post, extract information about the main person featured AND include the full article text.
+        If certain information isn't available, that's okay.
+        
+        IMPORTANT: Be sure to include ALL possible forms of the person's name that appear on the page.
+        Look for different name variants, nicknames, formal names, etc.
+        """
+        
+        # Parameters for scraping with prompt-based extraction
+        params = {
+            'formats': ['json', 'markdown'],
+            'jsonOptions': {
+                'prompt': extraction_prompt
+            }
+        }
+        
+        result = firecrawl_app.scrape_url(url, params)
+        
+        if result and 'json' in result and result['json']:
+            print(f"Successfully scraped person information from {url}")
             
-            IMPORTANT: Be sure to include ALL possible forms of the person's name that appear on the page.
-            Look for different name variants, nicknames, formal names, etc.
-            """
+            # Extract and collect all possible names explicitly
+            extracted_names = extract_name_candidates(result.get('json', {}), result.get('markdown', ''), url)
             
-            # Parameters for scraping with prompt-based extraction
-            params = {
-                'formats': ['json', 'markdown'],
-                'jsonOptions': {
-                    'prompt': extraction_prompt
-                }
+            return {
+                'person_info': result.get('json', {}),
+                'page_content': result.get('markdown', ''),
+                'metadata': result.get('metadata', {}),
+                'source_url': url,  # Track which URL was actually used
+                'candidate_names': extracted_names  # Add explicit name candidates
             }
+        else:
+            print(f"No structured data returned from Firecrawl for {url}")
             
-            result = firecrawl_app.scrape_url(current_url, params)
+    except Exception as e:
+        print(f"Error scraping {url} with Firecrawl: {e}")
+    
+    return None
+
+def scrape_url_key(url: str) -> str:
+    """
+    Key identifying the page a URL scrapes, so equivalent URLs are scraped once
+    
+    Social media URLs are reduced to their profile URL; scheme and host are
+    lower-cased, and fragments and trailing slashes are dropped.
+    """
+    url = (url or '').strip()
+    if is_social_media_url(url):
+        url = normalize_social_media_url(url)
+    parts = urllib.parse.urlsplit(url)
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, '')
+    )
+
+class ScrapePlan:
+    """
+    Scrapes for one face: each distinct URL at most once, within a budget
+    
+    The analyses of a face's results share one plan, so a URL scraped as one
+    result's fallback is not scraped again as another result's primary (or
+    fallback); the outcome, success or failure, is reused. Scrapes of the same
+    URL from different threads wait for the first one instead of repeating it.
+    
+    Each primary URL has a slot of the budget reserved for it, so fallbacks
+    of results that finish early can't spend the budget before the later
+    primaries are reached. Once the plan's deadline has passed no new paid
+    request is started, so scrapes still running after the face has given up
+    on them stop at their next fetch.
+    """
+    
+    def __init__(self, max_scrapes: Optional[int] = None, primary_urls: Optional[List[str]] = None,
+                 deadline: Optional[float] = None):
+        """
+        Initialize the plan
+        
+        Args:
+            max_scrapes: Most distinct URLs scraped for the face (default: SCRAPE_MAX_PER_FACE)
+            primary_urls: URLs of the results being analyzed; each gets a reserved slot
+            deadline: Optional time.monotonic() value after which nothing more is fetched
+        """
+        self.max_scrapes = SCRAPE_MAX_PER_FACE if max_scrapes is None else max(0, int(max_scrapes))
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.outcomes = {}
+        # Keys of primaries not scraped yet; fallbacks may only use the budget beyond these
+        self.reserved = {
+            scrape_url_key(url) for url in (primary_urls or [])
+            if url and url.startswith(('http://', 'https://'))
+        }
+        
+        # Counters reported by stats()
+        self.scrapes = 0
+        self.reused = 0
+        self.skipped = 0
+    
+    def scrape(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Scrape a URL unless the plan already has, or has run out of budget
+        
+        Args:
+            url: The URL to scrape
             
-            if result and 'json' in result and result['json']:
-                print(f"Successfully scraped person information from {current_url}")
-                
-                # Extract and collect all possible names explicitly
-                extracted_names = extract_name_candidates(result.get('json', {}), result.get('markdown', ''), current_url)
-                
-                return {
-                    'person_info': result.get('json', {}),
-                    'page_content': result.get('markdown', ''),
-                    'metadata': result.get('metadata', {}),
-                    'source_url': current_url,  # Track which URL was actually used
-                    'candidate_names': extracted_names  # Add explicit name candidates
-                }
+        Returns:
+            Scraped information (a copy, if it was shared), or None if scraping
+            failed now or earlier, or the budget or time is spent
+        """
+        if not url or not url.startswith(('http://', 'https://')):
+            return None
+        if past_deadline(self.deadline, url):
+            return None
+        
+        key = scrape_url_key(url)
+        with self.lock:
+            outcome = self.outcomes.get(key)
+            if outcome is None:
+                if key in self.reserved:
+                    available = self.max_scrapes - self.scrapes
+                else:
+                    available = self.max_scrapes - self.scrapes - len(self.reserved)
+                if available <= 0:
+                    self.skipped += 1
+                    print(f"Scrape budget of {self.max_scrapes} URLs spent for this face, skipping {url}")
+                    return None
+                outcome = {"done": threading.Event(), "data": None}
+                self.outcomes[key] = outcome
+                self.reserved.discard(key)
+                self.scrapes += 1
+                owner = True
             else:
-                print(f"No structured data returned from Firecrawl for {current_url}, trying next URL if available")
-                
-        except Exception as e:
-            print(f"Error scraping {current_url} with Firecrawl: {e}")
-            # Continue to the next URL
+                self.reused += 1
+                owner = False
+        
+        if owner:
+            try:
+                outcome["data"] = scrape_url(url, self.deadline)
+            finally:
+                outcome["done"].set()
+            return outcome["data"]
+        
+        outcome["done"].wait()
+        if outcome["data"] is not None:
+            print(f"Reusing scrape of {key}")
+        return copy.deepcopy(outcome["data"])
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the plan's scrape, reuse and skip counts"""
+        with self.lock:
+            return {"scrapes": self.scrapes, "reused": self.reused, "skipped": self.skipped}
+
+def scrape_with_firecrawl(url: str, fallback_urls: List[str] = None, scrape_plan: Optional[ScrapePlan] = None) -> Optional[Dict[str, Any]]:
+    """
+    Scrape a URL using Firecrawl to extract information about the person.
+    If the URL is for a social media platform that Zyte handles better, use Zyte instead.
+    If scraping fails and fallback_urls are provided, attempts to scrape those.
+    
+    Args:
+        url: The primary URL to scrape
+        fallback_urls: A list of alternative URLs to try if the primary fails
+        scrape_plan: Optional per-face plan; URLs it has already scraped are not scraped again
+        
+    Returns:
+        Dictionary containing the scraped information or None if all scraping failed
+    """
+    fetch = scrape_plan.scrape if scrape_plan else scrape_url
+    
+    scraped_data = fetch(url)
+    if scraped_data:
+        return scraped_data
+    
+    # A LinkedIn profile whose name couldn't be extracted has no fallbacks
+    if "linkedin.com/in/" in url.lower():
+        return None
+    
+    # Try each fallback URL in sequence until one succeeds
+    for fallback_url in fallback_urls or []:
+        print(f"Trying fallback URL: {fallback_url}")
+        scraped_data = fetch(fallback_url)
+        if scraped_data:
+            return scraped_data
     
     # If we get here, all URLs failed
     print("All scraping attempts failed")
@@ -761,7 +1001,7 @@ def extract_name_candidates(json_data: Dict, page_content: str, source_url: str)
         traceback.print_exc()  # Print full exception for debugging
         return candidates  # Return whatever we have
 
-def analyze_search_result(result: Dict[str, Any], result_index: int, temp_images_dir: str = None, fallback_urls: List[str] = None) -> Dict[str, Any]:
+def analyze_search_result(result: Dict[str, Any], result_index: int, temp_images_dir: str = None, fallback_urls: List[str] = None, scrape: bool = True, scrape_plan: Optional[ScrapePlan] = None) -> Dict[str, Any]:
     """
     Analyze a single search result to extract identity information
     
@@ -770,6 +1010,8 @@ def analyze_search_result(result: Dict[str, Any], result_index: int, temp_images
         result_index: Index number of this result
         temp_images_dir: Directory to temporarily save images (will be moved later)
         fallback_urls: A list of fallback URLs to try if scraping the primary URL fails
+        scrape: Whether to scrape the URL; without it scraped_data is None, as for a failed scrape
+        scrape_plan: Optional per-face plan shared with the face's other results
         
     Returns:
         Dictionary with enriched information
@@ -786,7 +1028,7 @@ def analyze_search_result(result: Dict[str, Any], result_index: int, temp_images
     source_type = sources[0] if sources else "Unknown source"
     
     # Scrape the URL if Firecrawl is available, with fallbacks
-    scraped_data = scrape_with_firecrawl(url, fallback_urls)
+    scraped_data = scrape_with_firecrawl(url, fallback_urls, scrape_plan) if scrape else None
     
     # Combine all information
     analysis = {
@@ -800,6 +1042,70 @@ def analyze_search_result(result: Dict[str, Any], result_index: int, temp_images
     
     return analysis
 
+def analyze_search_results(search_results: List[Dict[str, Any]], limit: int = SCRAPE_TOP_RESULTS) -> List[Dict[str, Any]]:
+    """
+    Analyze the top search results concurrently
+    
+    Each result is scraped on a pool of up to SCRAPE_WORKERS threads. The face
+    waits at most SCRAPE_DEADLINE_SECONDS for them; results still being scraped
+    then are kept without scraped data, so the finished ones can be saved,
+    and the deadline also stops those scrapes before their next paid fetch.
+    The results share a ScrapePlan, so no URL is scraped twice and at most
+    SCRAPE_MAX_PER_FACE URLs are scraped in all, primaries taking precedence
+    over fallbacks.
+    
+    Args:
+        search_results: List of search results from FaceCheckID
+        limit: Number of top results to analyze
+        
+    Returns:
+        List of analyses in the same order as the search results
+    """
+    top_results = search_results[:limit]
+    if not top_results:
+        return []
+    
+    deadline = time.monotonic() + SCRAPE_DEADLINE_SECONDS if SCRAPE_DEADLINE_SECONDS > 0 else None
+    scrape_plan = ScrapePlan(primary_urls=[result.get('url', '') for result in top_results], deadline=deadline)
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(SCRAPE_WORKERS, len(top_results))),
+        thread_name_prefix="scrape"
+    )
+    try:
+        futures = [
+            # Fallback URLs are the other results
+            executor.submit(
+                analyze_search_result, result, j, None, collect_fallback_urls(search_results, j - 1),
+                scrape_plan=scrape_plan
+            )
+            for j, result in enumerate(top_results, 1)
+        ]
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()) if deadline else None)
+        if not_done:
+            print(f"Scraping deadline of {SCRAPE_DEADLINE_SECONDS}s passed with {len(not_done)} of "
+                  f"{len(futures)} results unfinished; saving partial results")
+    finally:
+        # Don't wait for scrapes past the deadline. Queued ones are cancelled; running ones finish
+        # their current request in the background, start no other paid fetch, and are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    identity_analyses = []
+    for j, (result, future) in enumerate(zip(top_results, futures), 1):
+        analysis = None
+        if future in done:
+            try:
+                analysis = future.result()
+            except Exception as e:
+                print(f"Error analyzing result {j} ({result.get('url', '')}): {e}")
+        if analysis is None:
+            analysis = analyze_search_result(result, j, scrape=False)
+        identity_analyses.append(analysis)
+    
+    plan_stats = scrape_plan.stats()
+    print(f"Scraped {plan_stats['scrapes']} URLs for this face "
+          f"({plan_stats['reused']} reused, {plan_stats['skipped']} skipped over budget)")
+    return identity_analyses
+
 def get_identity_sources(url: str) -> List[str]:
     """
     Determine possible identity sources based on the URL
@@ -847,13 +1153,15 @@ def extract_domain(url: str) -> str:
     except:
         return url
 
-def process_single_face(image_file, timeout=300):
+def process_single_face(image_file, timeout=300, progress_callback=None):
     """
     Process a single face image
     
     Args:
         image_file: Path to the face image file
         timeout: Maximum time to wait for search results
+        progress_callback: Optional callable invoked with (progress, message)
+            as the FaceCheck search progresses
         
     Returns:
         True if processing was successful, False otherwise
@@ -862,67 +1170,79 @@ def process_single_face(image_file, timeout=300):
         print(f"Error: Face file '{image_file}' does not exist!")
         return False
     
-    print(f"Processing: {os.path.basename(image_file)}")
-    
     try:
-        # Read and encode the source image as base64
         with open(image_file, 'rb') as img_file:
-            source_image_data = img_file.read()
-            import base64
-            source_image_base64 = base64.b64encode(source_image_data).decode('utf-8')
-            
+            image_data = img_file.read()
+    except Exception as e:
+        print(f"Error reading face file {os.path.basename(image_file)}: {e}")
+        return False
+    
+    # Extract the basename without extension and path - this will be our face_id
+    face_id = face_id_for_file(image_file)
+    
+    return process_face_data(
+        face_id,
+        image_data,
+        filename=os.path.basename(image_file),
+        timeout=timeout,
+        progress_callback=progress_callback
+    )
+
+def process_face_data(face_id, image_data, filename=None, timeout=300, progress_callback=None):
+    """
+    Process a face image held in memory
+    
+    The same bytes are sent to FaceCheck and saved to the blob store,
+    without writing them to disk or base64-encoding them.
+    
+    Args:
+        face_id: Face ID to save the results under
+        image_data: Image bytes
+        filename: Optional original file name, sent with the FaceCheck upload
+        timeout: Maximum time to wait for search results
+        progress_callback: Optional callable invoked with (progress, message)
+            as the FaceCheck search progresses
+        
+    Returns:
+        True if processing was successful, False otherwise
+    """
+    filename = filename or f"{face_id}.jpg"
+    print(f"Processing: {filename}")
+    
+    try:
         # Search for the face with timeout
-        error, search_results = search_by_face(image_file, timeout=timeout)
+        error, search_results = search_by_face_data(image_data, filename, timeout=timeout, progress_callback=progress_callback)
         
         if search_results:
             # Print the search results summary
             print(f"Found {len(search_results)} potential matches")
             
-            # Process each result to get identity information
-            identity_analyses = []
-            
-            # Process top 5 results (original limit) with fallback functionality
-            for j, result in enumerate(search_results[:5], 1):  # Process top 5 results
-                # Collect fallback URLs from other results
-                fallback_urls = collect_fallback_urls(search_results, j-1)
-                
-                # Analyze this result with base64 data stored directly
-                analysis = analyze_search_result(result, j, None, fallback_urls)
-                identity_analyses.append(analysis)
+            # Process top 5 results (original limit) concurrently, with fallback functionality
+            identity_analyses = analyze_search_results(search_results)
             
             # Generate timestamp for the results
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             # Save the results with enhanced information
             results_data = {
-                "source_image_path": image_file,  # Keep for backward compatibility
-                "source_image_base64": source_image_base64,  # Store source image as base64
+                "source_image_path": filename,  # Keep for backward compatibility
+                "source_image_data": image_data,  # Raw bytes, stored in the blob store
                 "search_timestamp": timestamp,
                 "original_results": search_results,
                 "identity_analyses": identity_analyses
             }
             
-            # Extract the basename without extension and path - this will be our face_id
-            face_id = os.path.basename(image_file)
-            face_id = os.path.splitext(face_id)[0]  # Remove extension
-            
             from db_connector import save_face_result
             print(f"Saving results to database for face: {face_id}")
             save_face_result(face_id, results_data)
             
-            # Mark as processed
-            processed_faces = load_processed_faces()
-            if image_file not in processed_faces:
-                processed_faces.append(image_file)
-                save_processed_faces(processed_faces)
-            
             return True
         else:
             print(f"Search failed: {error}")
             return False
     
     except Exception as e:
-        print(f"Error processing face {os.path.basename(image_file)}: {e}")
+        print(f"Error processing face {filename}: {e}")
         traceback.print_exc()  # Print stack trace for better debugging
         return False
 
@@ -935,10 +1255,8 @@ def process_faces(faces_dir, limit=None, force=False, timeout=300):
         force: Process all faces even if previously processed
         timeout: Maximum time in seconds to wait for each search
     """
-    processed_faces = [] if force else load_processed_faces()
-    
     # Get unprocessed face images
-    unprocessed_files = get_unprocessed_faces(faces_dir, processed_faces)
+    unprocessed_files = get_unprocessed_faces(faces_dir, force=force)
     
     if not unprocessed_files:
         print("No new faces to process.")
@@ -962,11 +1280,8 @@ def process_faces(faces_dir, limit=None, force=False, timeout=300):
                 print(f"Failed to process: {image_file}")
             
         except KeyboardInterrupt:
-            print("\nProcess interrupted by user. Saving progress...")
-            # Save progress before exiting
-            if image_file not in processed_faces:
-                processed_faces.append(image_file)
-                save_processed_faces(processed_faces)
+            # Saved results are what mark a face as processed, so there is nothing to flush
+            print("\nProcess interrupted by user.")
             print("You can resume processing later.")
             raise
 
@@ -12,12 +12,12 @@ import os
 import json
 import time
 import re
-import requests
 import traceback
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 from NameResolver import NameResolver
+from http_client import get_client as get_http_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -33,14 +33,17 @@ class RecordChecker:
     PROVIDER_INTELIUS = "intelius"
     PROVIDER_SPOKEO = "spokeo"
     
-    def __init__(self, api_key=None, provider=None):
+    def __init__(self, api_key=None, provider=None, http_client=None):
         """
         Initialize the RecordChecker with API credentials
         
         Args:
             api_key: API key for the record search provider
             provider: Which provider to use (peopledata, intelius, spokeo)
+            http_client: Shared HTTP client for provider calls (default: the process-wide one)
         """
+        self.http_client = http_client or get_http_client()
+        
         # Use provided API key or get from environment
         self.api_key = api_key or os.getenv("RECORDS_API_KEY")
         if not self.api_key:
@@ -369,8 +372,8 @@ class RecordChecker:
                 print(f"[RECORDCHECKER] PDL API parameters: {json.dumps(pdl_params)}")
                 
                 # Call the Person Enrichment API
-                response = requests.post(
-                    url=f"{self.api_base_url}/person/enrich",
+                response = self.http_client.post(
+                    f"{self.api_base_url}/person/enrich",
                     headers=self.headers,
                     json=pdl_params
                 )
@@ -1013,10 +1016,10 @@ class RecordChecker:
         
         try:
             # Import database functions
-            from db_connector import get_identity_analyses, get_bio_text, save_record_data
+            from db_connector import get_identity_summaries, get_bio_text, save_record_data
             
             # Get identity analyses from database
-            identity_analyses = get_identity_analyses(face_id)
+            identity_analyses = get_identity_summaries(face_id)
             if not identity_analyses:
                 print(f"[RECORDCHECKER] No identity analyses found for face ID: {face_id}")
                 return False
@@ -1,16 +1,18 @@
 import os
 import time
 import json
-import threading
 import logging
 import signal
 import sys
 import tempfile
-from flask import Flask, request, jsonify
+import hashlib
+from flask import Flask, Request, Response, request, jsonify, stream_with_context
 from werkzeug.utils import secure_filename
 
 # Import the controller instead of individual components
 import controller
+import blob_store
+from events import EVENT_STATUS, EVENT_COMPLETE, SubscriberLimitError
 
 # Set up logging
 logging.basicConfig(
@@ -19,22 +21,195 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Backend")
 
+# Uploads up to this size stay in memory; larger ones spill to a temporary file
+UPLOAD_SPOOL_BYTES = 1024 * 1024
+
+class UploadRequest(Request):
+    """Request that buffers uploaded files in memory up to UPLOAD_SPOOL_BYTES"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="rb+")
+
 # Create Flask app
 app = Flask(__name__)
-
-# Create a temporary directory for uploads
-UPLOAD_FOLDER = tempfile.mkdtemp()
+app.request_class = UploadRequest
 
 # Configure Flask app settings
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
 
+# Seconds clients are asked to wait before retrying when the queue is full
+QUEUE_FULL_RETRY_AFTER = 5
+
+# Seconds clients are asked to wait before reopening an event stream when too many are open
+EVENTS_FULL_RETRY_AFTER = 10
+
+# Face statuses after which no more progress events will arrive
+FINAL_STATUSES = ("completed", "failed")
+
 # API routes
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({"status": "ok"})
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Pipeline metrics endpoint (queue depth and counters per stage)"""
+    return jsonify(controller.get_metrics())
+
+@app.route('/api/faces/<face_id>/status', methods=['GET'])
+def face_status(face_id):
+    """
+    Processing status of a face
+    Supports If-None-Match so unchanged status costs a 304
+    """
+    if not ensure_controller_initialized():
+        return jsonify({"error": "Processing pipeline is not available"}), 503
+    
+    try:
+        status = controller.get_face_status(face_id)
+    except Exception as e:
+        logger.error(f"Error getting status for face {face_id}: {str(e)}")
+        return jsonify({"error": "Failed to get face status"}), 500
+    
+    if status is None:
+        return jsonify({"error": "Face not found"}), 404
+    
+    etag = make_etag("status", json.dumps(status, sort_keys=True, default=str))
+    return conditional_response(etag, lambda: status)
+
+@app.route('/api/faces/<face_id>', methods=['GET'])
+def face_result(face_id):
+    """
+    Stored results for a face
+    The ETag is derived from the result's version timestamps, so a matching
+    If-None-Match returns 304 without loading or serializing the thumbnails.
+    Images are returned as URLs under /api/images; pass include_images=true
+    to inline them as base64 instead.
+    """
+    include_images = request.args.get('include_images', '').lower() in ('1', 'true', 'yes')
+
+    if not ensure_controller_initialized():
+        return jsonify({"error": "Processing pipeline is not available"}), 503
+    
+    try:
+        status = controller.get_face_status(face_id)
+    except Exception as e:
+        logger.error(f"Error getting status for face {face_id}: {str(e)}")
+        return jsonify({"error": "Failed to get face result"}), 500
+    
+    if status is None:
+        return jsonify({"error": "Face not found"}), 404
+    
+    if not status["has_result"]:
+        return jsonify({
+            "face_id": face_id,
+            "status": status["status"],
+            "message": "Face is still being processed" if status["status"] != "failed" else "Face processing failed"
+        }), 202
+    
+    def load_result():
+        result = controller.get_face_result(face_id, include_images=include_images)
+        if result is None:
+            raise LookupError(f"Result for face {face_id} disappeared")
+        return add_image_urls(result)
+    
+    etag = make_etag("result", face_id, status["result_version"], include_images)
+    try:
+        return conditional_response(etag, load_result)
+    except Exception as e:
+        logger.error(f"Error getting result for face {face_id}: {str(e)}")
+        return jsonify({"error": "Failed to get face result"}), 500
+
+@app.route('/api/images/<key>', methods=['GET'])
+def image(key):
+    """
+    Image bytes from the blob store
+    Keys are content hashes, so responses never change and can be cached forever
+    """
+    if not blob_store.is_valid_key(key):
+        return jsonify({"error": "Invalid image key"}), 400
+    
+    if not ensure_controller_initialized():
+        return jsonify({"error": "Processing pipeline is not available"}), 503
+    
+    etag = make_etag("image", key)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        try:
+            data = controller.get_image(key)
+        except Exception as e:
+            logger.error(f"Error fetching image {key}: {str(e)}")
+            return jsonify({"error": "Failed to fetch image"}), 500
+        if data is None:
+            return jsonify({"error": "Image not found"}), 404
+        response = app.response_class(data, mimetype=blob_store.guess_content_type(data))
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/api/faces/<face_id>/events', methods=['GET'])
+def face_events(face_id):
+    """
+    Server-sent event stream of a face's pipeline progress
+    Sends the current status first, then stage transitions and FaceCheck
+    search progress as they happen, and closes once processing has finished.
+    Each open stream holds a server thread, so past EVENTS_MAX_STREAMS per
+    process clients get a 503 and should poll the status endpoint instead
+    """
+    if not ensure_controller_initialized():
+        return jsonify({"error": "Processing pipeline is not available"}), 503
+    
+    # Subscribe before reading the status so no event is missed in between
+    try:
+        subscription = controller.subscribe_events(face_id)
+    except SubscriberLimitError:
+        response = jsonify({"error": "Too many event streams open, poll the status endpoint instead"})
+        response.headers['Retry-After'] = str(EVENTS_FULL_RETRY_AFTER)
+        return response, 503
+    try:
+        status = controller.get_face_status(face_id)
+    except Exception as e:
+        controller.unsubscribe_events(subscription)
+        logger.error(f"Error getting status for face {face_id}: {str(e)}")
+        return jsonify({"error": "Failed to get face status"}), 500
+    
+    if status is None:
+        controller.unsubscribe_events(subscription)
+        return jsonify({"error": "Face not found"}), 404
+    
+    heartbeat = controller.get_config("EVENTS_HEARTBEAT_SECONDS", 15)
+    max_duration = controller.get_config("EVENTS_MAX_STREAM_SECONDS", 300)
+    
+    def stream():
+        try:
+            yield format_sse(EVENT_STATUS, status)
+            if status["status"] in FINAL_STATUSES:
+                return
+            
+            # Streams are capped so they don't hold a server thread forever; EventSource reconnects
+            deadline = time.monotonic() + max_duration
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=min(heartbeat, max(0.0, deadline - time.monotonic())))
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield format_sse(event["type"], event)
+                if event["type"] == EVENT_COMPLETE and not event.get("retrying"):
+                    return
+        finally:
+            controller.unsubscribe_events(subscription)
+    
+    response = Response(stream_with_context(stream()), mimetype='text/event-stream')
+    # Frees the stream's slot even if the client goes away before the stream starts
+    response.call_on_close(lambda: controller.unsubscribe_events(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint for basic health check"""
@@ -55,70 +230,73 @@ def upload_face():
         return jsonify({"error": "No face file selected"}), 400
     
     if face_file:
-        # Generate secure filename
-        filename = secure_filename(face_file.filename)
-        timestamp = int(time.time())
-        filename = f"face_{timestamp}_{filename}"
+        # The controller assigns the face_id; the client's file name is only kept for reference
+        filename = secure_filename(face_file.filename) or "face.jpg"
         
-        # Save the file
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        face_file.save(file_path)
+        # Make sure the controller is running (gunicorn imports the app without calling main)
+        if not ensure_controller_initialized():
+            return jsonify({"error": "Processing pipeline is not available"}), 503
         
-        # Extract face_id from filename
-        face_id = os.path.splitext(filename)[0]
+        # Read the upload once; the same bytes are queued with the job and sent to FaceCheck
+        image_data = face_file.read()
+        if not image_data:
+            return jsonify({"error": "Face file is empty"}), 400
         
-        # Process the face in a background thread using the controller
-        thread = threading.Thread(
-            target=process_face_thread,
-            args=(file_path, face_id),
-            daemon=True
-        )
-        thread.start()
+        # Queue the face on the controller's bounded work queue
+        try:
+            queued = controller.process_face_data(filename, image_data)
+        except controller.QueueFullError:
+            response = jsonify({"error": "Server is busy, please retry later"})
+            response.headers['Retry-After'] = str(QUEUE_FULL_RETRY_AFTER)
+            return response, 429
         
+        if not queued:
+            return jsonify({"error": "Failed to queue face for processing"}), 500
+        
+        # A duplicate upload shares the face_id (and results) of the earlier upload
         return jsonify({
             "status": "success", 
-            "message": "Face uploaded and processing started",
-            "file_id": filename
+            "message": "Face already being processed" if queued["duplicate"] else "Face uploaded and processing started",
+            "file_id": queued["face_id"],  # Same as face_id, kept for older clients
+            "face_id": queued["face_id"],
+            "duplicate": queued["duplicate"]
         })
 
-def process_face_thread(face_path, face_id=None):
-    """Process a face in a background thread"""
-    logger.info(f"Starting processing for: {os.path.basename(face_path)}")
-    try:
-        # If face_id not provided, extract from path
-        if face_id is None:
-            face_id = os.path.splitext(os.path.basename(face_path))[0]
-            
-        # IMPORTANT: Process the face directly with FaceUpload FIRST
-        # This prevents the file deletion race condition
-        try:
-            import FaceUpload
-            logger.info(f"Directly processing face with FaceUpload: {os.path.basename(face_path)}")
-            success = FaceUpload.process_single_face(face_path)
-            
-            if success:
-                logger.info(f"Successfully processed face with FaceUpload: {os.path.basename(face_path)}")
-                
-                # Now queue additional processing (bio and records) through the controller
-                # Just pass the face_id since we don't need the file anymore
-                controller.process_additional_steps(face_id)
-            else:
-                logger.error(f"Failed to process face with FaceUpload: {os.path.basename(face_path)}")
-        except Exception as e:
-            logger.error(f"Error processing face with FaceUpload: {str(e)}")
-            success = False
-            
-    except Exception as e:
-        logger.error(f"Error in face processing thread: {str(e)}")
-        success = False
-    finally:
-        # Clean up the uploaded file after FaceUpload has processed it
-        try:
-            if os.path.exists(face_path):
-                os.remove(face_path)
-                logger.info(f"Removed temporary file: {os.path.basename(face_path)}")
-        except Exception as e:
-            logger.error(f"Error removing temporary file: {str(e)}")
+def ensure_controller_initialized():
+    """Initialize the controller on first use if it hasn't been initialized yet"""
+    if controller.controller.initialized:
+        return True
+    return controller.initialize()
+
+def make_etag(*parts):
+    """Build an ETag value from the parts that identify a response's content"""
+    return hashlib.sha1("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+def conditional_response(etag, build_body):
+    """
+    Return 304 if the client's If-None-Match matches the ETag,
+    otherwise build the body and return it with the ETag attached
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build_body())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def add_image_urls(result):
+    """Add an /api/images URL next to every blob key in a face result"""
+    if result.get("source_image_key"):
+        result["source_image_url"] = f"/api/images/{result['source_image_key']}"
+    for analysis in result.get("identity_analyses", []):
+        if analysis.get("thumbnail_key"):
+            analysis["thumbnail_url"] = f"/api/images/{analysis['thumbnail_key']}"
+    return result
+
+def format_sse(event_type, data):
+    """Format one server-sent event"""
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
 
 def main():
     """Main function to start the backend server"""
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+blob_store.py - Content-addressed storage for face images and thumbnails
+
+Image bytes are kept out of the database: rows store only the key returned
+by put(), which is the SHA-256 of the bytes, and the bytes are fetched
+lazily with get() when something actually needs them. Identical images
+share one blob.
+
+Two backends are available:
+- "local": files under BLOB_STORE_PATH, fanned out by key prefix
+- "gcs": a Google Cloud Storage bucket (needs google-cloud-storage)
+
+The local store only works where every process shares one durable disk.
+On Cloud Run (K_SERVICE is set) each instance has its own ephemeral disk,
+so gcs is the default there and the local backend is refused; elsewhere
+local is the default.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger("BlobStore")
+
+try:
+    from google.api_core.exceptions import PreconditionFailed
+    from google.cloud import storage as gcs_storage
+    GCS_AVAILABLE = True
+except ImportError:
+    GCS_AVAILABLE = False
+
+DEFAULT_LOCAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blob_store")
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def blob_key(data: bytes) -> str:
+    """Return the content address (hex SHA-256) of some bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_backend() -> str:
+    """Return the backend used when BLOB_STORE_BACKEND isn't set: gcs on Cloud Run, local elsewhere"""
+    return "gcs" if os.getenv("K_SERVICE") else "local"
+
+
+def is_valid_key(key: str) -> bool:
+    """Return True if key looks like a key produced by blob_key"""
+    return bool(key) and bool(_KEY_PATTERN.match(key))
+
+
+def guess_content_type(data: bytes) -> str:
+    """Guess an image's MIME type from its leading bytes"""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+class LocalBlobStore:
+    """Blob store backed by a directory on the local filesystem"""
+
+    def __init__(self, root: str = DEFAULT_LOCAL_PATH):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def put(self, data: bytes, content_type: Optional[str] = None) -> str:
+        """
+        Store bytes under their content address
+
+        Args:
+            data: Bytes to store
+            content_type: Ignored; the local store sniffs types on read
+
+        Returns:
+            The blob key
+        """
+        key = blob_key(data)
+        path = self._path(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial blob
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the bytes stored under key, or None if there are none"""
+        if not is_valid_key(key):
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class GCSBlobStore:
+    """Blob store backed by a Google Cloud Storage bucket"""
+
+    def __init__(self, bucket: str, prefix: str = "blobs/"):
+        if not GCS_AVAILABLE:
+            raise ImportError("google-cloud-storage is required for the gcs blob store")
+        self.client = gcs_storage.Client()
+        self.bucket = self.client.bucket(bucket)
+        self.prefix = prefix
+
+    def put(self, data: bytes, content_type: Optional[str] = None) -> str:
+        """
+        Store bytes under their content address
+
+        Args:
+            data: Bytes to store
+            content_type: MIME type recorded on the object (sniffed if omitted)
+
+        Returns:
+            The blob key
+        """
+        key = blob_key(data)
+        blob = self.bucket.blob(self.prefix + key)
+        try:
+            # Only create the object if it doesn't exist, without a separate existence check
+            blob.upload_from_string(
+                data, content_type=content_type or guess_content_type(data), if_generation_match=0
+            )
+        except PreconditionFailed:
+            # Same key, same bytes: the blob is already stored
+            pass
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the bytes stored under key, or None if there are none"""
+        if not is_valid_key(key):
+            return None
+        blob = self.bucket.blob(self.prefix + key)
+        try:
+            return blob.download_as_bytes()
+        except Exception as e:
+            logger.warning(f"Could not fetch blob {key} from GCS: {e}")
+            return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure(backend: Optional[str] = None, path: Optional[str] = None, bucket: Optional[str] = None):
+    """
+    Select the process-wide blob store
+
+    Args:
+        backend: "local" or "gcs" (default: default_backend(); "local" raises
+            ValueError on Cloud Run)
+        path: Directory for the local store (default: blob_store/ next to this module)
+        bucket: Bucket name for the gcs store
+
+    Returns:
+        The configured store
+    """
+    global _store
+
+    backend = backend or default_backend()
+    if backend == "gcs":
+        if not bucket:
+            raise ValueError("BLOB_STORE_BUCKET is required for the gcs blob store "
+                             "(the default backend on Cloud Run)")
+        store = GCSBlobStore(bucket)
+    elif backend == "local":
+        if os.getenv("K_SERVICE"):
+            # Blobs written to one instance's ephemeral disk are invisible to the others
+            # and lost when the instance is recycled
+            raise ValueError("The local blob store can't be used on Cloud Run; "
+                             "set BLOB_STORE_BACKEND=gcs and BLOB_STORE_BUCKET")
+        store = LocalBlobStore(path or DEFAULT_LOCAL_PATH)
+    else:
+        raise ValueError(f"Unknown blob store backend: {backend}")
+
+    with _store_lock:
+        _store = store
+    logger.info(f"Blob store configured: {backend}")
+    return store
+
+
+def get_store():
+    """Return the configured blob store, configuring it from the environment on first use"""
+    with _store_lock:
+        store = _store
+    if store is not None:
+        return store
+    return configure(
+        os.getenv("BLOB_STORE_BACKEND", "").lower() or None,
+        path=os.getenv("BLOB_STORE_PATH") or None,
+        bucket=os.getenv("BLOB_STORE_BUCKET") or None
+    )
@@ -7,12 +7,22 @@ controller that manages all components and their interactions.
 """
 
 import os
+import json
+import socket
 import threading
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
+from pipeline import StagePool, QueueFullError, PipelineStage, PipelineRun
+import events
+import image_hash
+import blob_store
+import http_client
+import scrape_cache
+import ids
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -58,11 +68,83 @@ class ConfigManager:
         self.config["DB_PORT"] = os.getenv("DB_PORT", "")
         self.config["INSTANCE_CONNECTION_NAME"] = os.getenv("INSTANCE_CONNECTION_NAME", "")
         
+        # Database connection pool: size, how long a checkout may wait for a free
+        # connection, and how long a connection may sit idle before it is pinged
+        self.config["DB_POOL_MIN"] = int(os.getenv("DB_POOL_MIN", "1"))
+        self.config["DB_POOL_MAX"] = int(os.getenv("DB_POOL_MAX", "10"))
+        self.config["DB_POOL_TIMEOUT"] = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.config["DB_POOL_HEALTH_CHECK_SECONDS"] = float(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", "30"))
+        
+        # Per-process cache of recently saved identity matches, read by the records
+        # and bio stages. IDENTITY_CACHE_SIZE=0 disables it.
+        self.config["IDENTITY_CACHE_SIZE"] = int(os.getenv("IDENTITY_CACHE_SIZE", "256"))
+        self.config["IDENTITY_CACHE_TTL_SECONDS"] = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "600"))
+        
+        # Blob store for face images and thumbnails ("local" or "gcs")
+        self.config["BLOB_STORE_BACKEND"] = os.getenv("BLOB_STORE_BACKEND", blob_store.default_backend()).lower()
+        self.config["BLOB_STORE_PATH"] = os.getenv("BLOB_STORE_PATH", "")
+        self.config["BLOB_STORE_BUCKET"] = os.getenv("BLOB_STORE_BUCKET", "")
+        
         # Server config
         self.config["PORT"] = int(os.getenv("PORT", "8080"))
         self.config["UPLOAD_FOLDER"] = os.getenv("UPLOAD_FOLDER", "")
         self.config["RESULTS_DIR"] = os.getenv("RESULTS_DIR", "")
         
+        # Process role: "web" only accepts uploads and serves status, "worker" only
+        # runs the pipeline, "all" does both in one process
+        self.config["EYESPY_ROLE"] = os.getenv("EYESPY_ROLE", "all").lower()
+        
+        # Pipeline config
+        self.config["PIPELINE_WORKERS"] = int(os.getenv("PIPELINE_WORKERS", "2"))
+        self.config["PIPELINE_QUEUE_SIZE"] = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+        self.config["RECORDS_WORKERS"] = int(os.getenv("RECORDS_WORKERS", "2"))
+        self.config["BIO_WORKERS"] = int(os.getenv("BIO_WORKERS", "2"))
+        self.config["PIPELINE_SHUTDOWN_TIMEOUT"] = float(os.getenv("PIPELINE_SHUTDOWN_TIMEOUT", "30"))
+        
+        # Durable job queue config
+        self.config["JOB_QUEUE_MAX"] = int(os.getenv("JOB_QUEUE_MAX", "1000"))
+        self.config["JOB_LEASE_SECONDS"] = int(os.getenv("JOB_LEASE_SECONDS", "900"))
+        self.config["JOB_MAX_ATTEMPTS"] = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+        self.config["JOB_RETRY_BASE_SECONDS"] = int(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+        self.config["JOB_RETRY_MAX_SECONDS"] = int(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+        self.config["JOB_POLL_INTERVAL"] = float(os.getenv("JOB_POLL_INTERVAL", "15"))
+        
+        # Duplicate upload detection: uploads matching a job created within the window
+        # reuse that job. DEDUP_WINDOW_SECONDS=0 disables it. The perceptual hash needs Pillow.
+        self.config["DEDUP_WINDOW_SECONDS"] = int(os.getenv("DEDUP_WINDOW_SECONDS", "600"))
+        self.config["DEDUP_PERCEPTUAL"] = os.getenv("DEDUP_PERCEPTUAL", "false").lower() in ("1", "true", "yes")
+        self.config["DEDUP_PHASH_DISTANCE"] = int(os.getenv("DEDUP_PHASH_DISTANCE", "4"))
+        
+        # Scraping of the top face search results: concurrent scrapes per face and the
+        # seconds a face waits for them before saving partial results
+        self.config["SCRAPE_WORKERS"] = int(os.getenv("SCRAPE_WORKERS", "5"))
+        self.config["SCRAPE_DEADLINE_SECONDS"] = float(os.getenv("SCRAPE_DEADLINE_SECONDS", "120"))
+        self.config["SCRAPE_MAX_PER_FACE"] = int(os.getenv("SCRAPE_MAX_PER_FACE", "10"))
+        
+        # Shared scrape result cache: seconds successful Zyte and Firecrawl scrapes
+        # and failed scrapes stay cached
+        self.config["SCRAPE_CACHE_ENABLED"] = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.config["SCRAPE_CACHE_TTL_ZYTE"] = float(os.getenv("SCRAPE_CACHE_TTL_ZYTE", "86400"))
+        self.config["SCRAPE_CACHE_TTL_FIRECRAWL"] = float(os.getenv("SCRAPE_CACHE_TTL_FIRECRAWL", "604800"))
+        self.config["SCRAPE_CACHE_FAILURE_TTL"] = float(os.getenv("SCRAPE_CACHE_FAILURE_TTL", "3600"))
+        
+        # Outbound HTTP (FaceCheckID, Zyte, records provider): kept-alive connections
+        # per host and default timeouts in seconds
+        self.config["HTTP_POOL_MAXSIZE"] = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+        self.config["HTTP_CONNECT_TIMEOUT"] = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        self.config["HTTP_READ_TIMEOUT"] = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+        
+        # FaceCheckID search polling: backoff bounds and jitter fraction
+        self.config["FACECHECK_POLL_MIN_SECONDS"] = float(os.getenv("FACECHECK_POLL_MIN_SECONDS", "1"))
+        self.config["FACECHECK_POLL_MAX_SECONDS"] = float(os.getenv("FACECHECK_POLL_MAX_SECONDS", "10"))
+        self.config["FACECHECK_POLL_JITTER"] = float(os.getenv("FACECHECK_POLL_JITTER", "0.2"))
+        
+        # Progress event streaming config
+        self.config["EVENTS_HEARTBEAT_SECONDS"] = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+        self.config["EVENTS_MAX_STREAM_SECONDS"] = float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "300"))
+        self.config["EVENTS_MAX_STREAMS"] = int(os.getenv("EVENTS_MAX_STREAMS", "4"))
+        self.config["EVENTS_PROGRESS_RELAY_SECONDS"] = float(os.getenv("EVENTS_PROGRESS_RELAY_SECONDS", "2"))
+        
         # Log the configuration (without sensitive values)
         self._log_config()
     
@@ -129,24 +211,51 @@ class EyeSpyController:
         self.face_uploader = None
         self.bio_generator = None
         self.record_checker = None
+        self.http_client = None
         self.name_resolver = None
         self.initialized = False
         
-        # Processing queue for background tasks
-        self.processing_queue = []
-        self.queue_lock = threading.Lock()
+        # Bounded worker pools for each pipeline stage, keyed by stage name
+        self.pools: Dict[str, StagePool] = {}
+        self.stage_handlers = {}
+        self.init_lock = threading.Lock()
         self.shutdown_requested = False
+        
+        # Durable job dispatching: jobs claimed by this process, keyed by job ID
+        self.worker_id = None
+        self.active_jobs: Dict[int, PipelineRun] = {}
+        self.jobs_lock = threading.Lock()
+        self.job_wakeup = threading.Event()
+        self.stop_event = threading.Event()
+        self.job_threads: List[threading.Thread] = []
+        
+        # Uploads that were attached to an existing job instead of starting a new one
+        self.duplicate_uploads = 0
+        
+        # Relays progress events published by pipeline workers in other processes
+        self.event_thread: Optional[threading.Thread] = None
+        # When each face's last progress event was relayed to other processes
+        self.progress_relayed_at: Dict[str, float] = {}
+        self.progress_relay_lock = threading.Lock()
     
-    def initialize(self, reload_config=False) -> bool:
+    def initialize(self, reload_config=False, start_workers=None) -> bool:
         """
         Initialize all components
         
         Args:
             reload_config: Whether to reload configuration from environment variables
+            start_workers: Whether to run the pipeline workers in this process.
+                Defaults to True unless EYESPY_ROLE is "web".
             
         Returns:
             True if initialization was successful, False otherwise
         """
+        # Serialize initialization so concurrent first requests don't initialize twice
+        with self.init_lock:
+            return self._initialize(reload_config, start_workers)
+    
+    def _initialize(self, reload_config=False, start_workers=None) -> bool:
+        """Initialize all components (caller must hold init_lock)"""
         if self.initialized and not reload_config:
             logger.info("Controller already initialized, skipping")
             return True
@@ -160,17 +269,56 @@ class EyeSpyController:
         try:
             logger.info("Initializing EyeSpy controller")
             
+            # Initialize the blob store holding face images and thumbnails
+            try:
+                blob_store.configure(
+                    self.config.get("BLOB_STORE_BACKEND") or None,
+                    path=self.config.get("BLOB_STORE_PATH") or None,
+                    bucket=self.config.get("BLOB_STORE_BUCKET") or None
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize blob store: {e}")
+                return False
+            
+            # Shared HTTP sessions for the outbound APIs
+            self.http_client = http_client.configure(
+                pool_maxsize=self.config.get("HTTP_POOL_MAXSIZE", 20),
+                connect_timeout=self.config.get("HTTP_CONNECT_TIMEOUT", 5),
+                read_timeout=self.config.get("HTTP_READ_TIMEOUT", 60)
+            )
+            
             # Initialize database connector
             try:
                 import db_connector
                 self.db_connector = db_connector
-                db_connector.init_connection_pool()
+                db_connector.init_connection_pool(
+                    min_connections=self.config.get("DB_POOL_MIN", 1),
+                    max_connections=self.config.get("DB_POOL_MAX", 10),
+                    acquire_timeout=self.config.get("DB_POOL_TIMEOUT", 30),
+                    health_check_seconds=self.config.get("DB_POOL_HEALTH_CHECK_SECONDS", 30)
+                )
+                db_connector.configure_identity_cache(
+                    self.config.get("IDENTITY_CACHE_SIZE", 256),
+                    self.config.get("IDENTITY_CACHE_TTL_SECONDS", 600)
+                )
+                scrape_cache.configure(
+                    ttl_seconds={
+                        scrape_cache.SOURCE_ZYTE: self.config.get("SCRAPE_CACHE_TTL_ZYTE", 86400),
+                        scrape_cache.SOURCE_FIRECRAWL: self.config.get("SCRAPE_CACHE_TTL_FIRECRAWL", 604800)
+                    },
+                    failure_ttl_seconds=self.config.get("SCRAPE_CACHE_FAILURE_TTL", 3600),
+                    enabled=self.config.get("SCRAPE_CACHE_ENABLED", True)
+                )
                 db_connector.validate_database_connection()
                 logger.info("Database connector initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize database connector: {e}")
                 return False
             
+            # Identifies this process in job leases and relayed events.
+            # Set here rather than in __init__ so forked gunicorn workers each get their own.
+            self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+            
             # Initialize name resolver
             try:
                 from NameResolver import NameResolver
@@ -193,6 +341,13 @@ class EyeSpyController:
                     FaceUpload.ZYTE_AVAILABLE = True
                 if self.config.get("OPENAI_API_KEY"):
                     FaceUpload.OPENAI_API_KEY = self.config.get("OPENAI_API_KEY")
+                FaceUpload.HTTP_CLIENT = self.http_client
+                FaceUpload.POLL_MIN_SECONDS = self.config.get("FACECHECK_POLL_MIN_SECONDS", 1)
+                FaceUpload.POLL_MAX_SECONDS = self.config.get("FACECHECK_POLL_MAX_SECONDS", 10)
+                FaceUpload.POLL_JITTER = self.config.get("FACECHECK_POLL_JITTER", 0.2)
+                FaceUpload.SCRAPE_WORKERS = self.config.get("SCRAPE_WORKERS", 5)
+                FaceUpload.SCRAPE_DEADLINE_SECONDS = self.config.get("SCRAPE_DEADLINE_SECONDS", 120)
+                FaceUpload.SCRAPE_MAX_PER_FACE = self.config.get("SCRAPE_MAX_PER_FACE", 10)
                 
                 self.face_uploader = FaceUpload
                 logger.info("FaceUpload initialized")
@@ -205,7 +360,10 @@ class EyeSpyController:
             if self.config.get("RECORDS_API_KEY"):
                 try:
                     from RecordChecker import RecordChecker
-                    self.record_checker = RecordChecker(api_key=self.config.get("RECORDS_API_KEY"))
+                    self.record_checker = RecordChecker(
+                        api_key=self.config.get("RECORDS_API_KEY"),
+                        http_client=self.http_client
+                    )
                     records_enabled = True
                     logger.info("RecordChecker initialized")
                 except Exception as e:
@@ -226,20 +384,29 @@ class EyeSpyController:
             else:
                 logger.warning("OPENAI_API_KEY not set, bio generation disabled")
             
-            # Start background processing thread
-            processing_thread = threading.Thread(
-                target=self._background_processor,
-                daemon=True
-            )
-            processing_thread.start()
-            logger.info("Background processor started")
+            # Start background processing workers and the job dispatcher feeding them,
+            # unless this is a web-only process that just enqueues jobs
+            if start_workers is None:
+                start_workers = self.config.get("EYESPY_ROLE", "all") != "web"
             
-            # Store component status
+            # Store component status (before the dispatcher starts building stage DAGs from it)
             self.components["db_connector"] = True
             self.components["face_uploader"] = True
             self.components["name_resolver"] = True
             self.components["record_checker"] = records_enabled
             self.components["bio_generator"] = bio_enabled
+            self.components["pipeline_workers"] = bool(start_workers)
+            
+            if start_workers:
+                self._start_pools(records_enabled, bio_enabled)
+                self._start_job_dispatcher()
+                logger.info("Background processor started")
+            else:
+                logger.info("Web role: pipeline workers not started in this process")
+            
+            # Processes that serve HTTP relay pipeline events from other processes to their clients
+            if self.config.get("EYESPY_ROLE", "all") != "worker":
+                self._start_event_listener()
             
             self.initialized = True
             logger.info("EyeSpy controller initialized successfully")
@@ -253,6 +420,63 @@ class EyeSpyController:
             logger.error(f"Failed to initialize controller: {e}")
             return False
     
+    def _start_pools(self, records_enabled: bool, bio_enabled: bool):
+        """
+        Create and start the worker pool for each enabled pipeline stage
+        
+        Args:
+            records_enabled: Whether the records stage has a RecordChecker
+            bio_enabled: Whether the bio stage has a BioGenerator
+        """
+        # Map each stage to the method that executes it
+        self.stage_handlers = {
+            "face_search": self._run_face_search,
+            "records": self._process_records,
+            "bio": self._generate_bio,
+        }
+        
+        queue_size = self.config.get("PIPELINE_QUEUE_SIZE", 100)
+        stages = [
+            ("face_search", self.config.get("PIPELINE_WORKERS", 2), True),
+            ("records", self.config.get("RECORDS_WORKERS", 2), records_enabled),
+            ("bio", self.config.get("BIO_WORKERS", 2), bio_enabled),
+        ]
+        
+        for name, workers, enabled in stages:
+            if not enabled:
+                continue
+            if name not in self.pools:
+                self.pools[name] = StagePool(name, self._run_stage, workers=workers, max_queue_size=queue_size)
+            self.pools[name].start()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and throughput metrics for each pipeline stage
+        
+        Returns:
+            Dictionary with per-stage metrics, this worker's job counts,
+            database connection pool metrics, identity cache counters,
+            FaceCheckID polling histograms, outbound HTTP metrics per host and
+            scrape cache counters
+        """
+        with self.jobs_lock:
+            active_jobs = len(self.active_jobs)
+        
+        return {
+            "db_pool": self.db_connector.pool_stats() if self.db_connector else None,
+            "identity_cache": self.db_connector.identity_cache_stats() if self.db_connector else None,
+            "face_search_polling": self.face_uploader.get_search_poll_metrics() if self.face_uploader else None,
+            "http": self.http_client.stats() if self.http_client else None,
+            "scrape_cache": scrape_cache.get_cache().stats(),
+            "stages": {name: pool.stats() for name, pool in self.pools.items()},
+            "jobs": {
+                "worker_id": self.worker_id,
+                "active": active_jobs,
+                "duplicate_uploads": self.duplicate_uploads
+            },
+            "events": events.bus.stats()
+        }
+    
     def _log_component_status(self):
         """Log the status of all components"""
         logger.info("System Components Status:")
@@ -260,45 +484,157 @@ class EyeSpyController:
             status_str = "ENABLED" if status else "DISABLED"
             logger.info(f"  - {component}: {status_str}")
     
-    def process_face(self, image_path: str) -> bool:
+    def _build_stages(self, include_face_search: bool = True) -> List[PipelineStage]:
+        """
+        Build the stage DAG for one face
+        
+        Records and bio both need the face search results. Bio also waits for
+        records to finish (successfully or not) so it can include record data.
+        
+        Args:
+            include_face_search: Whether the DAG starts with the face search stage
+            
+        Returns:
+            List of pipeline stages
         """
-        Process a face image through the complete pipeline
+        records_enabled = bool(self.components.get("record_checker") and self.record_checker)
+        bio_enabled = bool(self.components.get("bio_generator") and self.bio_generator)
+        
+        stages = []
+        requires = []
+        if include_face_search:
+            stages.append(PipelineStage("face_search"))
+            requires = ["face_search"]
+        
+        if records_enabled:
+            stages.append(PipelineStage("records", requires=requires))
+        
+        if bio_enabled:
+            stages.append(PipelineStage("bio", requires=requires, after=["records"] if records_enabled else []))
         
-        This method replaces the monkey-patched approach with a clean,
-        centralized processing flow.
+        return stages
+    
+    def _new_run(self, face_id: str, stages: List[PipelineStage], context: Optional[Dict[str, Any]] = None) -> PipelineRun:
+        """Create a PipelineRun wired to the controller's stage pools"""
+        return PipelineRun(
+            face_id,
+            stages,
+            dispatch=self._dispatch_stage,
+            on_stage_finished=self._on_stage_finished,
+            on_complete=self._on_run_complete,
+            context=context
+        )
+    
+    def process_face(self, image_path: str, cleanup: bool = False) -> bool:
+        """
+        Process a face image file through the complete pipeline
         
         Args:
             image_path: Path to the face image file
+            cleanup: Whether to delete the image file once it has been queued
             
         Returns:
             True if the face was queued for processing, False otherwise
+            
+        Raises:
+            QueueFullError: If the processing queue is at capacity
         """
-        if not self.initialized:
-            logger.error("Controller not initialized, cannot process face")
-            return False
-        
         if not os.path.exists(image_path):
             logger.error(f"Face image not found: {image_path}")
             return False
         
-        # Extract face_id from the image path
-        face_id = os.path.splitext(os.path.basename(image_path))[0]
+        try:
+            with open(image_path, 'rb') as f:
+                image_data = f.read()
+        except Exception as e:
+            logger.error(f"Error reading face image {image_path}: {e}")
+            return False
+        
+        queued = self.process_face_data(os.path.basename(image_path), image_data)
+        
+        # The job holds its own copy of the image
+        if queued and cleanup:
+            self._remove_file(image_path)
+        
+        return queued is not None
+    
+    def process_face_data(self, filename: str, image_data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Process an in-memory face image through the complete pipeline
+        
+        The bytes are stored with the job and handed to FaceUpload as they are,
+        so the image never has to be written to or re-read from disk. If the
+        same image was queued within DEDUP_WINDOW_SECONDS, the upload is
+        attached to that job instead of starting a new pipeline.
+        
+        Args:
+            filename: Original file name of the image, kept in the job payload
+            image_data: Image bytes
+            
+        Returns:
+            Dictionary with the face_id and job_id the upload was queued under and
+            whether it was a duplicate, or None if the face could not be queued
+            
+        Raises:
+            QueueFullError: If the processing queue is at capacity
+        """
+        if not self.initialized:
+            logger.error("Controller not initialized, cannot process face")
+            return None
+        
+        if not image_data:
+            logger.error(f"Face image is empty: {filename}")
+            return None
+        
+        # Time-ordered and unique across processes, unlike names built from the upload time
+        face_id = ids.new_face_id()
         
         try:
-            # Queue the face for processing
-            with self.queue_lock:
-                self.processing_queue.append({
-                    "image_path": image_path,
-                    "face_id": face_id,
-                    "timestamp": time.time()
-                })
-            
-            logger.info(f"Face queued for processing: {face_id}")
-            return True
+            # New work is refused once the shared backlog is full; the check runs in the
+            # enqueue transaction, after the duplicate lookup
+            max_pending = self.config.get("JOB_QUEUE_MAX", 1000)
             
+            # Store the image with the job so the face survives worker restarts
+            payload = {"filename": os.path.basename(filename)}
+            max_attempts = self.config.get("JOB_MAX_ATTEMPTS", 5)
+            window = self.config.get("DEDUP_WINDOW_SECONDS", 600)
+            
+            if window > 0:
+                phash = image_hash.perceptual_hash(image_data) if self.config.get("DEDUP_PERCEPTUAL") else None
+                queued = self.db_connector.enqueue_unique_job(
+                    face_id,
+                    image_hash.content_hash(image_data),
+                    payload=payload,
+                    image_data=image_data,
+                    max_attempts=max_attempts,
+                    window_seconds=window,
+                    image_phash=phash,
+                    phash_distance=self.config.get("DEDUP_PHASH_DISTANCE", 4),
+                    max_pending=max_pending
+                )
+            else:
+                job_id = self.db_connector.enqueue_job(
+                    face_id, payload=payload, image_data=image_data, max_attempts=max_attempts, max_pending=max_pending
+                )
+                queued = {"job_id": job_id, "face_id": face_id, "duplicate": False}
+            
+            if queued["duplicate"]:
+                self.duplicate_uploads += 1
+                logger.info(f"Duplicate upload {face_id} attached to face {queued['face_id']} (job {queued['job_id']})")
+                return queued
+            
+            # Wake the local dispatcher without waiting for the notification round trip
+            self.job_wakeup.set()
+            
+            logger.info(f"Face queued for processing: {face_id} (job {queued['job_id']})")
+            return queued
+            
+        except self.db_connector.JobQueueFullError as e:
+            logger.warning(f"Processing queue full, rejecting face: {face_id} ({e})")
+            raise QueueFullError(str(e))
         except Exception as e:
             logger.error(f"Error queueing face for processing: {e}")
-            return False
+            return None
     
     def process_additional_steps(self, face_id: str) -> bool:
         """
@@ -318,35 +654,9 @@ class EyeSpyController:
             # Trigger record checking and bio generation if enabled
             logger.info(f"Processing additional steps for face: {face_id}")
             
-            # Step 1: Process records if record checker is available
-            if self.components.get("record_checker") and self.record_checker:
-                try:
-                    logger.info(f"Processing records for face: {face_id}")
-                    
-                    # Do this in a separate thread to avoid blocking
-                    threading.Thread(
-                        target=self._process_records,
-                        args=(face_id,),
-                        daemon=True
-                    ).start()
-                    
-                except Exception as e:
-                    logger.error(f"Error starting record processing: {e}")
-            
-            # Step 2: Generate bio if bio generator is available
-            if self.components.get("bio_generator") and self.bio_generator:
-                try:
-                    logger.info(f"Queueing bio generation for face: {face_id}")
-                    
-                    # Do this in a separate thread to avoid blocking
-                    threading.Thread(
-                        target=self._generate_bio,
-                        args=(face_id,),
-                        daemon=True
-                    ).start()
-                    
-                except Exception as e:
-                    logger.error(f"Error starting bio generation: {e}")
+            stages = self._build_stages(include_face_search=False)
+            if stages:
+                self._new_run(face_id, stages).start()
             
             return True
             
@@ -354,124 +664,459 @@ class EyeSpyController:
             logger.error(f"Error processing additional steps for face {face_id}: {e}")
             return False
     
-    def _process_records(self, face_id: str):
-        """Process records for a face in a separate thread"""
-        try:
-            logger.info(f"Starting record processing for face: {face_id}")
-            record_success = self.record_checker.process_face_record(face_id)
+    def get_face_status(self, face_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the processing status of a face
+        
+        Args:
+            face_id: Face ID to look up
             
-            if record_success:
-                logger.info(f"Records successfully processed for face: {face_id}")
-            else:
-                logger.warning(f"No records found for face: {face_id}")
-                
-        except Exception as e:
-            logger.error(f"Error processing records: {e}")
+        Returns:
+            Status dictionary, or None if the face is unknown
+        """
+        if not self.db_connector:
+            raise RuntimeError("Controller not initialized, cannot look up face status")
+        return self.db_connector.get_face_status(face_id)
     
-    def _generate_bio(self, face_id: str):
-        """Generate bio for a face in a separate thread"""
-        try:
-            # Wait a bit to ensure records processing has a chance to complete
-            time.sleep(2)
-            
-            logger.info(f"Starting bio generation for face: {face_id}")
-            bio = self.bio_generator.process_result_directory(face_id)
+    def get_face_result(self, face_id: str, include_images: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored results for a face
+        
+        Args:
+            face_id: Face ID to look up
+            include_images: Whether to inline image bytes as base64 instead of only blob keys
             
-            if bio:
-                logger.info(f"Bio successfully generated for face: {face_id}")
-            else:
-                logger.warning(f"Failed to generate bio for face: {face_id}")
-                
-        except Exception as e:
-            logger.error(f"Error generating bio: {e}")
-    
-    def _background_processor(self):
-        """Background thread that processes queued faces"""
-        logger.info("Background processor started")
-        
-        while not self.shutdown_requested:
-            # Check if there are any faces to process
-            with self.queue_lock:
-                if self.processing_queue:
-                    # Get the next face to process
-                    face_item = self.processing_queue.pop(0)
-                else:
-                    # No faces to process, sleep for a bit
-                    face_item = None
-            
-            if face_item:
-                # Process the face
-                self._process_face_item(face_item)
-            else:
-                # Sleep for a bit before checking again
-                time.sleep(1)
+        Returns:
+            Result dictionary, or None if the face has no results yet
+        """
+        if not self.db_connector:
+            raise RuntimeError("Controller not initialized, cannot look up face result")
+        return self.db_connector.get_face_result(face_id, include_images=include_images)
     
-    def _process_face_item(self, face_item: Dict[str, Any]):
+    def get_image(self, key: str) -> Optional[bytes]:
         """
-        Process a single face item through the complete pipeline
+        Get image bytes from the blob store
         
         Args:
-            face_item: Dictionary containing face processing information
+            key: Blob key from a face result
+            
+        Returns:
+            Image bytes, or None if the key is unknown
+        """
+        if not self.db_connector:
+            raise RuntimeError("Controller not initialized, cannot fetch image")
+        return self.db_connector.get_image(key)
+    
+    def subscribe_events(self, face_id: str) -> events.Subscription:
         """
-        image_path = face_item["image_path"]
-        face_id = face_item["face_id"]
+        Subscribe to pipeline progress events for a face
         
-        logger.info(f"Processing face: {face_id}")
+        Raises:
+            events.SubscriberLimitError: If EVENTS_MAX_STREAMS streams are already open
+        """
+        max_streams = self.config.get("EVENTS_MAX_STREAMS", 4)
+        return events.bus.subscribe(face_id, max_subscribers=max_streams if max_streams > 0 else None)
+    
+    def unsubscribe_events(self, subscription: events.Subscription):
+        """Stop receiving pipeline progress events for a subscription"""
+        events.bus.unsubscribe(subscription)
+    
+    def publish_event(self, face_id: str, event_type: str, **data):
+        """
+        Publish a pipeline event to local subscribers and to other processes
         
+        Args:
+            face_id: Face ID the event belongs to
+            event_type: One of the events.EVENT_* types
+            **data: Event-specific fields
+        """
+        event = events.make_event(face_id, event_type, **data)
+        events.bus.publish(event)
+        
+        # Clients may be connected to a different web process than the one running the face
+        if not self.db_connector or not self._should_relay(face_id, event_type):
+            return
         try:
-            # Step 1: Process face with FaceUpload
-            success = self.face_uploader.process_single_face(image_path)
+            self.db_connector.notify_event(json.dumps({"origin": self.worker_id, "event": event}, default=str))
+        except Exception as e:
+            logger.warning(f"Error relaying {event_type} event for face {face_id}: {e}")
+    
+    def _should_relay(self, face_id: str, event_type: str) -> bool:
+        """
+        Decide whether an event is sent to other processes
+        
+        Stage and completion events always are. FaceCheck progress ticks are
+        coalesced to one per EVENTS_PROGRESS_RELAY_SECONDS per face, so a
+        search doesn't cost a database round trip for every percent.
+        """
+        now = time.monotonic()
+        with self.progress_relay_lock:
+            if event_type != events.EVENT_PROGRESS:
+                if event_type == events.EVENT_COMPLETE:
+                    self.progress_relayed_at.pop(face_id, None)
+                return True
             
-            if not success:
-                logger.error(f"Failed to process face with FaceUpload: {face_id}")
-                return
+            interval = self.config.get("EVENTS_PROGRESS_RELAY_SECONDS", 2)
+            last = self.progress_relayed_at.get(face_id)
+            if last is not None and now - last < interval:
+                return False
+            self.progress_relayed_at[face_id] = now
+            return True
+    
+    def _start_event_listener(self):
+        """Start the thread that relays events from other processes to local subscribers"""
+        if self.event_thread and self.event_thread.is_alive():
+            return
+        
+        self.stop_event.clear()
+        self.event_thread = threading.Thread(target=self._listen_for_events, name="event-listener", daemon=True)
+        self.event_thread.start()
+    
+    def _listen_for_events(self):
+        """Republish events from other processes' pipelines (Postgres LISTEN/NOTIFY)"""
+        while not self.stop_event.is_set():
+            conn = None
+            try:
+                conn = self.db_connector.open_listen_connection(self.db_connector.EVENT_CHANNEL)
+                while not self.stop_event.is_set():
+                    for notification in self.db_connector.wait_for_notifications(conn, timeout=5):
+                        try:
+                            message = json.loads(notification.payload)
+                        except ValueError:
+                            continue
+                        # Our own events were already delivered locally
+                        if message.get("origin") == self.worker_id:
+                            continue
+                        event = message.get("event") or {}
+                        if events.bus.has_subscribers(event.get("face_id")):
+                            events.bus.publish(event)
+            except Exception as e:
+                logger.error(f"Event listener error, reconnecting: {e}")
+                self.stop_event.wait(5)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+    
+    def _start_job_dispatcher(self):
+        """Start the threads that claim durable jobs and feed the face search pool"""
+        if any(thread.is_alive() for thread in self.job_threads):
+            return
+        
+        self.stop_event.clear()
+        self.job_threads = [
+            threading.Thread(target=self._listen_for_jobs, name="job-listener", daemon=True),
+            threading.Thread(target=self._dispatch_jobs, name="job-dispatcher", daemon=True),
+        ]
+        for thread in self.job_threads:
+            thread.start()
+        logger.info(f"Job dispatcher started for worker {self.worker_id}")
+    
+    def _listen_for_jobs(self):
+        """Wake the dispatcher whenever a job is enqueued anywhere (Postgres LISTEN/NOTIFY)"""
+        while not self.stop_event.is_set():
+            conn = None
+            try:
+                conn = self.db_connector.open_listen_connection()
+                while not self.stop_event.is_set():
+                    # Short timeout so shutdown is noticed promptly
+                    if self.db_connector.wait_for_notifications(conn, timeout=5):
+                        self.job_wakeup.set()
+            except Exception as e:
+                logger.error(f"Job listener error, reconnecting: {e}")
+                self.stop_event.wait(5)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+    
+    def _dispatch_jobs(self):
+        """
+        Claim jobs whenever the face search pool has idle workers
+        
+        The dispatcher sleeps on an event that is set by new-job notifications
+        and by face search stages finishing. The wait also times out every
+        JOB_POLL_INTERVAL seconds to pick up retries whose backoff has elapsed
+        and to heartbeat the leases of running jobs.
+        """
+        lease_seconds = self.config.get("JOB_LEASE_SECONDS", 900)
+        wait_timeout = min(self.config.get("JOB_POLL_INTERVAL", 15), lease_seconds / 3)
+        last_heartbeat = time.monotonic()
+        
+        while not self.stop_event.is_set():
+            self.job_wakeup.clear()
+            capacity = 0
+            claimed = 0
             
-            logger.info(f"Face successfully processed with FaceUpload: {face_id}")
+            try:
+                if time.monotonic() - last_heartbeat >= wait_timeout:
+                    self._heartbeat_jobs(lease_seconds)
+                    last_heartbeat = time.monotonic()
+                
+                capacity = self.pools["face_search"].idle_capacity()
+                if capacity:
+                    jobs = self.db_connector.claim_jobs(self.worker_id, limit=capacity, lease_seconds=lease_seconds)
+                    claimed = len(jobs)
+                    for job in jobs:
+                        self._start_job(job)
+            except Exception as e:
+                logger.error(f"Error dispatching jobs: {e}")
             
-            # Step 2: Process records if record checker is available
-            if self.components.get("record_checker") and self.record_checker:
-                try:
-                    logger.info(f"Processing records for face: {face_id}")
-                    record_success = self.record_checker.process_face_record(face_id)
-                    
-                    if record_success:
-                        logger.info(f"Records successfully processed for face: {face_id}")
-                    else:
-                        logger.warning(f"No records found for face: {face_id}")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing records: {e}")
+            # A full batch means more jobs may be waiting, so check again right away
+            if capacity and claimed == capacity:
+                continue
             
-            # Step 3: Generate bio if bio generator is available
-            if self.components.get("bio_generator") and self.bio_generator:
-                try:
-                    logger.info(f"Generating bio for face: {face_id}")
-                    bio = self.bio_generator.process_result_directory(face_id)
-                    
-                    if bio:
-                        logger.info(f"Bio successfully generated for face: {face_id}")
-                    else:
-                        logger.warning(f"Failed to generate bio for face: {face_id}")
-                        
-                except Exception as e:
-                    logger.error(f"Error generating bio: {e}")
+            self.job_wakeup.wait(timeout=wait_timeout)
+    
+    def _heartbeat_jobs(self, lease_seconds: int):
+        """Extend leases on jobs this worker is running, dead-letter abandoned ones and prune expired scrapes"""
+        with self.jobs_lock:
+            job_ids = list(self.active_jobs.keys())
+        
+        if job_ids:
+            self.db_connector.extend_job_leases(job_ids, self.worker_id, lease_seconds)
+        
+        dead = self.db_connector.dead_letter_expired_jobs()
+        if dead:
+            logger.warning(f"Moved {dead} job(s) with expired leases to the dead-letter state")
+        
+        pruned = self.db_connector.prune_scrape_cache()
+        if pruned:
+            logger.info(f"Pruned {pruned} expired scrape cache entries")
+    
+    def _start_job(self, job: Dict[str, Any]):
+        """
+        Start the pipeline run for a claimed job
+        
+        Args:
+            job: Job dictionary returned by db_connector.claim_jobs
+        """
+        face_id = job["face_id"]
+        logger.info(f"Claimed job {job['id']} for face {face_id} (attempt {job['attempts']}/{job['max_attempts']})")
+        
+        run = self._new_run(face_id, self._build_stages(), context={
+            "job_id": job["id"],
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "image_data": job["image_data"],
+            "filename": job["payload"].get("filename")
+        })
+        
+        with self.jobs_lock:
+            self.active_jobs[job["id"]] = run
+        
+        try:
+            run.start()
+        except Exception as e:
+            # Couldn't hand it to a worker after all; put it back for someone else
+            logger.error(f"Failed to start job {job['id']}: {e}")
+            with self.jobs_lock:
+                self.active_jobs.pop(job["id"], None)
+            self.db_connector.release_jobs([job["id"]], self.worker_id)
+    
+    def _dispatch_stage(self, run: PipelineRun, stage: str):
+        """Queue a ready stage on its worker pool (raises QueueFullError when full)"""
+        logger.info(f"Queueing {stage} stage for face: {run.face_id}")
+        self.pools[stage].submit((run, stage))
+        self.publish_event(run.face_id, events.EVENT_STAGE, stage=stage, status=PipelineRun.QUEUED)
+    
+    def _run_stage(self, item):
+        """
+        Stage pool handler: execute one stage and report the outcome to its run
+        
+        Args:
+            item: Tuple of (PipelineRun, stage name)
             
-            logger.info(f"Face processing complete: {face_id}")
+        Returns:
+            Whether the stage succeeded, so the pool counts failed stages
+        """
+        run, stage = item
+        run.stage_started(stage)
+        self.publish_event(run.face_id, events.EVENT_STAGE, stage=stage, status=PipelineRun.RUNNING)
+        
+        success = False
+        error = None
+        try:
+            success = bool(self.stage_handlers[stage](run))
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Error in {stage} stage for face {run.face_id}: {e}")
+        finally:
+            run.stage_finished(stage, success, error)
+        return success
+    
+    def _on_stage_finished(self, run: PipelineRun, stage: str):
+        """Persist the finished stage's timing on the job and face rows"""
+        # A face search worker just freed up, so the dispatcher can claim another job
+        if stage == "face_search":
+            self.job_wakeup.set()
+        
+        timing = run.get_timings([stage]).get(stage, {})
+        self.publish_event(
+            run.face_id,
+            events.EVENT_STAGE,
+            stage=stage,
+            status=timing.get("status"),
+            duration_seconds=timing.get("duration_seconds"),
+            error=timing.get("error")
+        )
+        
+        if not self.db_connector:
+            return
+        try:
+            saved = self.db_connector.save_stage_timings(
+                run.face_id, {stage: timing}, job_id=run.context.get("job_id")
+            )
+            if not saved:
+                logger.warning(f"No job or face row to record {stage} timings on for face {run.face_id}")
+        except Exception as e:
+            logger.error(f"Error saving {stage} timings for face {run.face_id}: {e}")
+    
+    def _on_run_complete(self, run: PipelineRun):
+        """Mark the run's job as done, or failed so it is retried or dead-lettered"""
+        logger.info(f"Face processing complete: {run.face_id} ({run.status})")
+        
+        succeeded = run.succeeded("face_search")
+        self.publish_event(
+            run.face_id,
+            events.EVENT_COMPLETE,
+            status="completed" if succeeded else "failed",
+            # A failed search is retried unless the job has used all its attempts
+            retrying=not succeeded and run.context.get("attempts", 0) < run.context.get("max_attempts", 0),
+            stages=dict(run.status)
+        )
+        
+        job_id = run.context.get("job_id")
+        if job_id is None:
+            return
+        
+        with self.jobs_lock:
+            self.active_jobs.pop(job_id, None)
+        
+        try:
+            # Records and bio are best effort; only a failed face search is retried
+            if succeeded:
+                self.db_connector.complete_job(job_id, self.worker_id)
+            else:
+                error = run.get_timings(["face_search"]).get("face_search", {}).get("error")
+                self.db_connector.fail_job(
+                    job_id,
+                    self.worker_id,
+                    error or "Face search failed",
+                    retry_base_seconds=self.config.get("JOB_RETRY_BASE_SECONDS", 30),
+                    retry_max_seconds=self.config.get("JOB_RETRY_MAX_SECONDS", 3600)
+                )
+                logger.warning(f"Job {job_id} for face {run.face_id} failed, scheduled for retry or dead-lettered")
+        except Exception as e:
+            logger.error(f"Error updating job {job_id} for face {run.face_id}: {e}")
+    
+    def _run_face_search(self, run: PipelineRun) -> bool:
+        """
+        Face search stage: process the face image with FaceUpload
+        
+        Args:
+            run: Pipeline run for the face
             
+        Returns:
+            True if FaceUpload processed and saved the face, False otherwise
+        """
+        face_id = run.face_id
+        logger.info(f"Processing face: {face_id}")
+        
+        # The job's image bytes go straight to FaceUpload; nothing is written to disk
+        success = self.face_uploader.process_face_data(
+            face_id,
+            run.context["image_data"],
+            filename=run.context.get("filename"),
+            progress_callback=lambda progress, message: self.publish_event(
+                face_id, events.EVENT_PROGRESS, stage="face_search", progress=progress, message=message
+            )
+        )
+        
+        if not success:
+            logger.error(f"Failed to process face with FaceUpload: {face_id}")
+            return False
+        
+        logger.info(f"Face successfully processed with FaceUpload: {face_id}")
+        return True
+    
+    def _process_records(self, run: PipelineRun) -> bool:
+        """Records stage: search public records for the face"""
+        face_id = run.face_id
+        logger.info(f"Starting record processing for face: {face_id}")
+        record_success = self.record_checker.process_face_record(face_id)
+        
+        if record_success:
+            logger.info(f"Records successfully processed for face: {face_id}")
+        else:
+            logger.warning(f"No records found for face: {face_id}")
+        
+        return record_success
+    
+    def _generate_bio(self, run: PipelineRun) -> bool:
+        """Bio stage: generate the bio once records have finished"""
+        face_id = run.face_id
+        logger.info(f"Starting bio generation for face: {face_id}")
+        bio = self.bio_generator.process_result_directory(face_id)
+        
+        if bio:
+            logger.info(f"Bio successfully generated for face: {face_id}")
+            return True
+        
+        logger.warning(f"Failed to generate bio for face: {face_id}")
+        return False
+    
+    def _remove_file(self, path: str):
+        """Remove a temporary file, logging rather than raising on failure"""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+                logger.info(f"Removed temporary file: {os.path.basename(path)}")
         except Exception as e:
-            logger.error(f"Error processing face {face_id}: {e}")
+            logger.error(f"Error removing temporary file: {e}")
     
     def shutdown(self):
         """Shut down the controller and all components"""
         logger.info("Shutting down controller")
         self.shutdown_requested = True
         
-        # Wait for background processor to finish
+        # Stop claiming new jobs
+        self.stop_event.set()
+        self.job_wakeup.set()
+        for thread in self.job_threads:
+            thread.join(timeout=5)
+        if self.event_thread:
+            self.event_thread.join(timeout=5)
+        
+        # Drain the stages in pipeline order, since face search feeds records and bio
         logger.info("Waiting for background processor to finish")
-        for _ in range(5):  # Wait up to 5 seconds
-            if not self.processing_queue:
-                break
-            time.sleep(1)
+        deadline = time.monotonic() + self.config.get("PIPELINE_SHUTDOWN_TIMEOUT", 30)
+        for name in ["face_search", "records", "bio"]:
+            pool = self.pools.get(name)
+            if pool:
+                pool.shutdown(timeout=max(0.0, deadline - time.monotonic()))
+        
+        # Hand jobs whose face search didn't finish back to the queue for another worker.
+        # Jobs that already have search results are completed so the search isn't paid for twice.
+        with self.jobs_lock:
+            unfinished = dict(self.active_jobs)
+            self.active_jobs.clear()
+        if unfinished and self.db_connector:
+            try:
+                to_release = []
+                for job_id, run in unfinished.items():
+                    if run.succeeded("face_search"):
+                        self.db_connector.complete_job(job_id, self.worker_id)
+                    else:
+                        to_release.append(job_id)
+                released = self.db_connector.release_jobs(to_release, self.worker_id)
+                logger.info(f"Released {released} unfinished job(s) back to the queue")
+            except Exception as e:
+                logger.error(f"Error releasing unfinished jobs: {e}")
         
         # Shut down database connection
         if self.db_connector and hasattr(self.db_connector, "stop_cloud_sql_proxy"):
@@ -481,28 +1126,60 @@ class EyeSpyController:
             except Exception as e:
                 logger.error(f"Error closing database connection: {e}")
         
+        # Close pooled outbound HTTP connections
+        if self.http_client:
+            self.http_client.close()
+        
         logger.info("Controller shutdown complete")
 
 
 # Singleton instance for global access
 controller = EyeSpyController()
 
-def initialize(reload_config=False):
+def initialize(reload_config=False, start_workers=None):
     """Initialize the controller and all components"""
-    return controller.initialize(reload_config=reload_config)
+    return controller.initialize(reload_config=reload_config, start_workers=start_workers)
 
-def process_face(image_path: str) -> bool:
+def process_face(image_path: str, cleanup: bool = False) -> bool:
     """Process a face image through the complete pipeline"""
-    return controller.process_face(image_path)
+    return controller.process_face(image_path, cleanup=cleanup)
+
+def process_face_data(filename: str, image_data: bytes):
+    """Process an in-memory face image through the complete pipeline"""
+    return controller.process_face_data(filename, image_data)
 
 def process_additional_steps(face_id: str) -> bool:
     """Process additional steps for a face (bio and records)"""
     return controller.process_additional_steps(face_id)
 
+def get_face_status(face_id: str):
+    """Get the processing status of a face"""
+    return controller.get_face_status(face_id)
+
+def get_face_result(face_id: str, include_images: bool = False):
+    """Get the stored results for a face"""
+    return controller.get_face_result(face_id, include_images=include_images)
+
+def get_image(key: str):
+    """Get image bytes from the blob store"""
+    return controller.get_image(key)
+
+def subscribe_events(face_id: str):
+    """Subscribe to pipeline progress events for a face"""
+    return controller.subscribe_events(face_id)
+
+def unsubscribe_events(subscription):
+    """Stop receiving pipeline progress events for a subscription"""
+    controller.unsubscribe_events(subscription)
+
 def shutdown():
     """Shut down the controller and all components"""
     controller.shutdown()
 
+def get_metrics():
+    """Get pipeline stage metrics from the controller"""
+    return controller.get_metrics()
+
 
 def get_config(key, default=None):
     """Get a configuration value from the controller"""
@@ -4,15 +4,24 @@ import subprocess
 import atexit
 import time
 import platform
-from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from urllib.parse import urlparse
 import json
 import datetime
 import logging
 import tempfile
+import select
+import base64
+import threading
+import copy
 from dotenv import load_dotenv
 
+import blob_store
+from metrics import Histogram
+from ttl_cache import TTLCache
+
 _pool_initialized = False
 
 load_dotenv()
@@ -28,6 +37,51 @@ pool = None
 proxy_process = None
 proxy_binary_path = None
 
+# Connection string used by the pool, kept for dedicated LISTEN connections
+_conn_string = None
+
+# Pool sizing and checkout behaviour. init_connection_pool takes these from
+# the controller's config; the environment is the fallback for scripts.
+DEFAULT_POOL_MIN = 1
+DEFAULT_POOL_MAX = 10
+DEFAULT_POOL_TIMEOUT = 30.0
+DEFAULT_POOL_HEALTH_CHECK_SECONDS = 30.0
+
+_pool_settings = {}
+
+# Limits checkouts to the pool size so callers wait (up to the timeout)
+# instead of getting "connection pool exhausted"
+_pool_slots = None
+
+# Checkout bookkeeping for pool_stats(), guarded by _pool_stats_lock
+_pool_stats_lock = threading.Lock()
+_pool_in_use = 0
+_pool_waiters = 0
+_pool_counters = {"checkouts": 0, "timeouts": 0, "discarded": 0}
+_pool_wait_seconds = Histogram()
+
+# When each idle connection was last returned, by id(conn)
+_conn_returned_at = {}
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no pooled connection becomes free within the acquire timeout"""
+
+# Job queue
+JOB_CHANNEL = "eyespy_jobs"
+JOB_TYPE_FACE_PIPELINE = "face_pipeline"
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_DONE = "done"
+JOB_STATUS_DEAD = "dead"
+
+# Pipeline progress events relayed between processes
+EVENT_CHANNEL = "eyespy_events"
+
+# Recently saved identity matches, per face. FaceUpload's save primes it so the
+# records and bio stages in the same process read them without a query.
+_identity_cache = TTLCache()
+
 def download_proxy_if_needed():
     """Download the Cloud SQL proxy if it doesn't exist"""
     global proxy_binary_path
@@ -165,9 +219,20 @@ DEFAULT_DB_CONFIG = {
 }
 
 # Then update your init_connection_pool function to use these defaults:
-def init_connection_pool():
-    """Initialize the connection pool."""
-    global pool, _pool_initialized
+def init_connection_pool(min_connections=None, max_connections=None, acquire_timeout=None,
+                         health_check_seconds=None):
+    """
+    Initialize the connection pool.
+
+    Args:
+        min_connections: Connections opened up front (default: DB_POOL_MIN or 1)
+        max_connections: Most connections checked out at once (default: DB_POOL_MAX or 10)
+        acquire_timeout: Seconds to wait for a free connection (default: DB_POOL_TIMEOUT or 30)
+        health_check_seconds: Connections idle longer than this are pinged before
+            they are handed out; 0 pings on every checkout (default:
+            DB_POOL_HEALTH_CHECK_SECONDS or 30)
+    """
+    global pool, _pool_initialized, _conn_string, _pool_slots, _pool_settings
 
     if pool is not None and _pool_initialized:
         logger.info("Database connection pool already initialized, reusing existing pool")
@@ -278,10 +343,30 @@ def init_connection_pool():
     safe_conn_info = conn_string.replace(db_pass, "******") if db_pass else conn_string
     logger.info(f"Connecting to database: {safe_conn_info}")
     
+    if min_connections is None:
+        min_connections = int(os.environ.get("DB_POOL_MIN", DEFAULT_POOL_MIN))
+    if max_connections is None:
+        max_connections = int(os.environ.get("DB_POOL_MAX", DEFAULT_POOL_MAX))
+    if acquire_timeout is None:
+        acquire_timeout = float(os.environ.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT))
+    if health_check_seconds is None:
+        health_check_seconds = float(os.environ.get("DB_POOL_HEALTH_CHECK_SECONDS", DEFAULT_POOL_HEALTH_CHECK_SECONDS))
+    max_connections = max(1, int(max_connections))
+    min_connections = min(max(0, int(min_connections)), max_connections)
+    
     # Create connection pool with min/max connections
     try:
-        pool = ThreadedConnectionPool(1, 10, conn_string)
-        logger.info("Database connection pool initialized successfully")
+        _conn_string = conn_string
+        _pool_settings = {
+            "min": min_connections,
+            "max": max_connections,
+            "acquire_timeout": float(acquire_timeout),
+            "health_check_seconds": float(health_check_seconds)
+        }
+        _pool_slots = threading.BoundedSemaphore(max_connections)
+        pool = ThreadedConnectionPool(min_connections, max_connections, conn_string)
+        logger.info(f"Database connection pool initialized successfully "
+                    f"(min={min_connections}, max={max_connections}, timeout={acquire_timeout}s)")
         
         # Create the database schema if it doesn't exist
         create_schema()
@@ -293,103 +378,341 @@ def init_connection_pool():
         logger.error(f"Failed to initialize connection pool: {e}")
         raise
 
-# Rest of your code remains unchanged
+def _connection_is_usable(conn):
+    """Check a pooled connection before handing it out, pinging it if it has sat idle"""
+    if conn.closed:
+        return False
+    if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    
+    returned_at = _conn_returned_at.get(id(conn))
+    if returned_at is not None and time.monotonic() - returned_at < _pool_settings["health_check_seconds"]:
+        return True
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+def _discard_connection(conn):
+    """Close a broken connection and drop it from the pool so a fresh one is opened"""
+    _conn_returned_at.pop(id(conn), None)
+    with _pool_stats_lock:
+        _pool_counters["discarded"] += 1
+    try:
+        pool.putconn(conn, close=True)
+    except Exception as e:
+        logger.warning(f"Error discarding database connection: {e}")
+
+def _checkout_connection():
+    """Take a live connection from the pool, replacing dead ones (e.g. after a failover)"""
+    # Every idle connection may be stale after a failover, so allow one pass over
+    # the whole pool before giving up; a failure to open a new connection raises
+    for _ in range(_pool_settings["max"] + 1):
+        conn = pool.getconn()
+        if _connection_is_usable(conn):
+            _conn_returned_at.pop(id(conn), None)
+            return conn
+        logger.warning("Discarding dead database connection")
+        _discard_connection(conn)
+    raise psycopg2.OperationalError("Could not obtain a live database connection")
+
 @contextmanager
 def get_db_connection():
-    """Get a connection from the pool."""
+    """
+    Get a connection from the pool.
+    
+    Waits up to the pool's acquire timeout for a free connection and raises
+    PoolTimeoutError if none frees up. Connections are checked before they are
+    handed out, and connections that broke while in use are replaced.
+    """
+    global _pool_in_use, _pool_waiters
+    
     if pool is None:
         init_connection_pool()
     
-    conn = pool.getconn()
+    wait_started = time.monotonic()
+    with _pool_stats_lock:
+        _pool_waiters += 1
+    try:
+        acquired = _pool_slots.acquire(timeout=_pool_settings["acquire_timeout"])
+    finally:
+        with _pool_stats_lock:
+            _pool_waiters -= 1
+    _pool_wait_seconds.observe(time.monotonic() - wait_started)
+    
+    if not acquired:
+        with _pool_stats_lock:
+            _pool_counters["timeouts"] += 1
+        raise PoolTimeoutError(
+            f"Timed out after {_pool_settings['acquire_timeout']}s waiting for a database connection")
+    
+    try:
+        conn = _checkout_connection()
+    except Exception:
+        _pool_slots.release()
+        raise
+    
+    with _pool_stats_lock:
+        _pool_in_use += 1
+        _pool_counters["checkouts"] += 1
     try:
         yield conn
     finally:
-        pool.putconn(conn)
+        with _pool_stats_lock:
+            _pool_in_use -= 1
+        if conn.closed:
+            _discard_connection(conn)
+        else:
+            _conn_returned_at[id(conn)] = time.monotonic()
+            pool.putconn(conn)
+            # The pool closes connections returned beyond its minimum size
+            if conn.closed:
+                _conn_returned_at.pop(id(conn), None)
+        _pool_slots.release()
+
+def pool_stats():
+    """
+    Get connection pool metrics
+    
+    Returns:
+        Dictionary with pool limits, in-use and waiting counts, checkout
+        counters and a histogram of checkout wait times in seconds
+    """
+    with _pool_stats_lock:
+        stats = {
+            "in_use": _pool_in_use,
+            "waiters": _pool_waiters,
+            **_pool_counters
+        }
+    stats["min"] = _pool_settings.get("min")
+    stats["max"] = _pool_settings.get("max")
+    stats["idle"] = len(pool._pool) if pool is not None else 0
+    stats["wait_seconds"] = _pool_wait_seconds.snapshot()
+    return stats
 
 @contextmanager
-def get_db_cursor():
-    """Get a cursor from a connection from the pool."""
+def get_db_cursor(named=False):
+    """
+    Get a cursor from a connection from the pool.
+    
+    Args:
+        named: Return rows as dictionaries keyed by column name instead of tuples
+    """
     with get_db_connection() as conn:
-        cursor = conn.cursor()
+        cursor = conn.cursor(cursor_factory=RealDictCursor) if named else conn.cursor()
         try:
             yield cursor
             conn.commit()
         except Exception:
-            conn.rollback()
+            # A connection lost mid-query can't be rolled back; the pool replaces it
+            if not conn.closed:
+                conn.rollback()
             raise
         finally:
             cursor.close()
 
+# Schema migrations, applied in order by create_schema. Each entry is
+# (version, description, statements). Applied versions are recorded in
+# schema_migrations, so every migration runs once per database. Never edit
+# a released migration; append a new one instead. The early migrations use
+# IF NOT EXISTS so they also apply cleanly to databases created before
+# migrations were tracked.
+MIGRATIONS = [
+    (1, "initial schema", [
+        """
+        CREATE TABLE IF NOT EXISTS faces (
+            id SERIAL PRIMARY KEY,
+            face_id TEXT UNIQUE,
+            image_base64 TEXT,
+            upload_timestamp TIMESTAMP,
+            processing_status TEXT,
+            search_timestamp TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS identity_matches (
+            id SERIAL PRIMARY KEY,
+            face_id TEXT REFERENCES faces(face_id),
+            url TEXT,
+            score FLOAT,
+            source_type TEXT,
+            thumbnail_base64 TEXT,
+            scraped_data JSONB
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS person_profiles (
+            id SERIAL PRIMARY KEY,
+            face_id TEXT REFERENCES faces(face_id),
+            full_name TEXT,
+            bio_text TEXT,
+            bio_timestamp TIMESTAMP,
+            record_data JSONB,
+            record_timestamp TIMESTAMP,
+            record_search_names TEXT[]
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS raw_results (
+            id SERIAL PRIMARY KEY,
+            face_id TEXT REFERENCES faces(face_id),
+            result_type TEXT,
+            raw_data JSONB,
+            timestamp TIMESTAMP
+        )
+        """,
+    ]),
+    (2, "per-stage pipeline timings", [
+        "ALTER TABLE faces ADD COLUMN IF NOT EXISTS stage_timings JSONB",
+    ]),
+    (3, "durable job queue", [
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id BIGSERIAL PRIMARY KEY,
+            face_id TEXT NOT NULL,
+            job_type TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            payload JSONB,
+            image_data BYTEA,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 5,
+            run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            locked_by TEXT,
+            lease_expires_at TIMESTAMPTZ,
+            last_error TEXT,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS jobs_queued_idx ON jobs (job_type, run_after, id) WHERE status = 'queued'",
+        "CREATE INDEX IF NOT EXISTS jobs_running_idx ON jobs (job_type, lease_expires_at) WHERE status = 'running'",
+        "CREATE INDEX IF NOT EXISTS jobs_face_id_idx ON jobs (face_id)",
+    ]),
+    (4, "job content hashes for duplicate uploads", [
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS content_hash TEXT",
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS image_phash BIGINT",
+        "CREATE INDEX IF NOT EXISTS jobs_content_hash_idx ON jobs (content_hash, created_at)",
+        "CREATE INDEX IF NOT EXISTS jobs_created_at_idx ON jobs (job_type, created_at)",
+    ]),
+    (5, "face_id indexes for per-face lookups", [
+        "CREATE INDEX IF NOT EXISTS identity_matches_face_id_idx ON identity_matches (face_id)",
+        "CREATE INDEX IF NOT EXISTS raw_results_face_id_idx ON raw_results (face_id, result_type)",
+    ]),
+    (6, "one person profile per face", [
+        # Fold duplicate profiles into the newest one, keeping any column only an older row has
+        """
+        UPDATE person_profiles keep SET
+            full_name = COALESCE(keep.full_name, (SELECT o.full_name FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.full_name IS NOT NULL ORDER BY o.id DESC LIMIT 1)),
+            bio_text = COALESCE(keep.bio_text, (SELECT o.bio_text FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.bio_text IS NOT NULL ORDER BY o.id DESC LIMIT 1)),
+            bio_timestamp = COALESCE(keep.bio_timestamp, (SELECT o.bio_timestamp FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.bio_timestamp IS NOT NULL ORDER BY o.id DESC LIMIT 1)),
+            record_data = COALESCE(keep.record_data, (SELECT o.record_data FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.record_data IS NOT NULL ORDER BY o.id DESC LIMIT 1)),
+            record_timestamp = COALESCE(keep.record_timestamp, (SELECT o.record_timestamp FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.record_timestamp IS NOT NULL ORDER BY o.id DESC LIMIT 1)),
+            record_search_names = COALESCE(keep.record_search_names, (SELECT o.record_search_names FROM person_profiles o
+                WHERE o.face_id = keep.face_id AND o.record_search_names IS NOT NULL ORDER BY o.id DESC LIMIT 1))
+        WHERE keep.id = (SELECT MAX(n.id) FROM person_profiles n WHERE n.face_id = keep.face_id)
+          AND EXISTS (SELECT 1 FROM person_profiles d WHERE d.face_id = keep.face_id AND d.id <> keep.id)
+        """,
+        """
+        DELETE FROM person_profiles p
+        USING person_profiles newer
+        WHERE p.face_id = newer.face_id AND p.id < newer.id
+        """,
+        # The unique constraint's index also serves face_id lookups
+        "DROP INDEX IF EXISTS person_profiles_face_id_idx",
+        "ALTER TABLE person_profiles ADD CONSTRAINT person_profiles_face_id_key UNIQUE (face_id)",
+    ]),
+    (7, "image and thumbnail blob keys", [
+        # New rows keep images in the blob store; the base64 columns remain for older rows
+        "ALTER TABLE faces ADD COLUMN IF NOT EXISTS image_key TEXT",
+        "ALTER TABLE identity_matches ADD COLUMN IF NOT EXISTS thumbnail_key TEXT",
+    ]),
+    (8, "scrape result cache", [
+        """
+        CREATE TABLE IF NOT EXISTS scrape_cache (
+            source TEXT NOT NULL,
+            url_key TEXT NOT NULL,
+            success BOOLEAN NOT NULL,
+            data JSONB,
+            fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            expires_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (source, url_key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS scrape_cache_expires_at_idx ON scrape_cache (expires_at)",
+    ]),
+    (9, "stage timings on jobs", [
+        # A failed face search leaves no faces row, so timings are also kept on the job
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS stage_timings JSONB",
+    ]),
+]
+
+# Arbitrary key for the advisory lock serializing migrations across processes
+MIGRATION_LOCK_KEY = 7210431
+
 def create_schema():
-    """Create the database schema if it doesn't exist."""
+    """
+    Bring the database schema up to date by applying pending migrations
+    
+    Safe to call on every startup: applied migrations are skipped, and an
+    advisory lock stops concurrently starting processes from applying the
+    same migration twice. Each migration runs in its own transaction.
+    
+    Returns:
+        Number of migrations applied
+    """
     with get_db_connection() as conn:
         with conn.cursor() as cursor:
-            # Check if tables exist
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'faces'
-                );
-            """)
-            tables_exist = cursor.fetchone()[0]
-            
-            if not tables_exist:
-                logger.info("Creating database schema...")
-                
-                # Create faces table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS faces (
-                        id SERIAL PRIMARY KEY,
-                        face_id TEXT UNIQUE,
-                        image_base64 TEXT,
-                        upload_timestamp TIMESTAMP,
-                        processing_status TEXT,
-                        search_timestamp TIMESTAMP
-                    );
-                """)
-                
-                # Create identity_matches table
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            try:
                 cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS identity_matches (
-                        id SERIAL PRIMARY KEY,
-                        face_id TEXT REFERENCES faces(face_id),
-                        url TEXT,
-                        score FLOAT,
-                        source_type TEXT,
-                        thumbnail_base64 TEXT,
-                        scraped_data JSONB
-                    );
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version INTEGER PRIMARY KEY,
+                        description TEXT,
+                        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    )
                 """)
+                conn.commit()
                 
-                # Create person_profiles table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS person_profiles (
-                        id SERIAL PRIMARY KEY,
-                        face_id TEXT REFERENCES faces(face_id),
-                        full_name TEXT,
-                        bio_text TEXT,
-                        bio_timestamp TIMESTAMP,
-                        record_data JSONB,
-                        record_timestamp TIMESTAMP,
-                        record_search_names TEXT[]
-                    );
-                """)
+                cursor.execute("SELECT version FROM schema_migrations")
+                applied_versions = {row[0] for row in cursor.fetchall()}
                 
-                # Create raw_results table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS raw_results (
-                        id SERIAL PRIMARY KEY,
-                        face_id TEXT REFERENCES faces(face_id),
-                        result_type TEXT,
-                        raw_data JSONB,
-                        timestamp TIMESTAMP
-                    );
-                """)
+                applied = 0
+                for version, description, statements in MIGRATIONS:
+                    if version in applied_versions:
+                        continue
+                    
+                    logger.info(f"Applying schema migration {version}: {description}")
+                    try:
+                        for statement in statements:
+                            cursor.execute(statement)
+                        cursor.execute(
+                            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                            (version, description)
+                        )
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        logger.error(f"Schema migration {version} failed: {e}")
+                        raise
+                    applied += 1
                 
+                if applied:
+                    logger.info(f"Applied {applied} schema migration(s), schema is at version {MIGRATIONS[-1][0]}")
+                else:
+                    logger.info("Database schema is up to date.")
+                return applied
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
                 conn.commit()
-                logger.info("Database schema created successfully.")
-            else:
-                logger.info("Database schema already exists.")
 
 # Helper functions for database operations
 def load_processed_faces():
@@ -399,207 +722,545 @@ def load_processed_faces():
         results = cursor.fetchall()
         return [row[0] for row in results]
 
+def is_processed(face_ids):
+    """
+    Check which faces already have results, using the faces.face_id index
+
+    Args:
+        face_ids: Iterable of face IDs to check
+
+    Returns:
+        Set of the given face IDs that exist in the faces table
+    """
+    face_ids = list(dict.fromkeys(face_ids))
+    if not face_ids:
+        return set()
+
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT face_id FROM faces WHERE face_id = ANY(%s)", (face_ids,))
+        return {row[0] for row in cursor.fetchall()}
+
+def _decode_base64_image(value):
+    """Decode a base64 image, with or without a data: URL prefix"""
+    if not value:
+        return None
+    if value.startswith("data:") and "," in value:
+        value = value.split(",", 1)[1]
+    return base64.b64decode(value)
+
+def store_image(data):
+    """
+    Save image bytes in the blob store
+    
+    Args:
+        data: Image bytes (None is passed through)
+        
+    Returns:
+        The blob key, or None if there was no image
+    """
+    if not data:
+        return None
+    return blob_store.get_store().put(data)
+
+def get_image(key):
+    """Fetch image bytes from the blob store (None if the key is unknown)"""
+    if not key:
+        return None
+    return blob_store.get_store().get(key)
+
+def _image_base64(key, legacy_base64, include_images, data_url=False):
+    """
+    Base64 for an image column pair: the legacy inline value if the row has one,
+    otherwise the blob fetched from the store when include_images is set
+    """
+    if legacy_base64 or not include_images:
+        return legacy_base64
+    data = get_image(key)
+    if data is None:
+        return None
+    encoded = base64.b64encode(data).decode('utf-8')
+    if data_url:
+        return f"data:{blob_store.guess_content_type(data)};base64,{encoded}"
+    return encoded
+
+def store_result_images(result_data):
+    """
+    Save a face result's source image and match thumbnails in the blob store
+    
+    Args:
+        result_data: Result dictionary passed to save_face_result
+        
+    Returns:
+        Tuple of (source image key, list of thumbnail keys in match order)
+    """
+    image_key = store_image(
+        result_data.get('source_image_data') or _decode_base64_image(result_data.get('source_image_base64'))
+    )
+    thumbnail_keys = [
+        store_image(_decode_base64_image(match.get('thumbnail_base64')))
+        for match in result_data.get('identity_analyses', [])
+    ]
+    return image_key, thumbnail_keys
+
 def save_face_result(face_id, result_data):
-    """Save face search results to the database."""
+    """
+    Save face search results to the database
+    
+    All writes (clearing an earlier attempt, the face row, the raw results
+    and every identity match as one multi-row insert) are sent to the
+    server as a single batch, so saving costs one round trip however many
+    matches there are.
+    
+    The source image (raw `source_image_data`, or `source_image_base64`) and
+    the match thumbnails go to the blob store; the rows only keep their keys.
+    """
     # Convert non-serializable objects to strings
     if isinstance(result_data.get('search_timestamp'), datetime.datetime):
         result_data['search_timestamp'] = result_data['search_timestamp'].strftime("%Y%m%d_%H%M%S")
     
+    now = datetime.datetime.now()
+    search_timestamp = result_data.get('search_timestamp')
+    
+    # Images are content-addressed, so storing them before the transaction is safe to repeat
+    image_key, thumbnail_keys = store_result_images(result_data)
+    matches = result_data.get('identity_analyses', [])
+    scraped_data = [json.dumps(match.get('scraped_data', {})) for match in matches]
+    
+    invalidate_identity_cache(face_id)
     with get_db_cursor() as cursor:
-        # Insert face record
-        cursor.execute(
-            "INSERT INTO faces (face_id, image_base64, upload_timestamp, processing_status, search_timestamp) "
-            "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (face_id) DO UPDATE "
-            "SET processing_status = %s, search_timestamp = %s RETURNING id",
-            (
-                face_id, 
-                result_data.get('source_image_base64'), 
-                datetime.datetime.now(), 
-                'processed', 
-                result_data.get('search_timestamp'), 
-                'processed', 
-                result_data.get('search_timestamp')
+        statements = [
+            # Clear results from any earlier attempt so a retried job doesn't duplicate them
+            cursor.mogrify("DELETE FROM identity_matches WHERE face_id = %s", (face_id,)),
+            cursor.mogrify("DELETE FROM raw_results WHERE face_id = %s AND result_type = 'face_search'", (face_id,)),
+            
+            # Insert face record
+            cursor.mogrify(
+                "INSERT INTO faces (face_id, image_key, upload_timestamp, processing_status, search_timestamp) "
+                "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (face_id) DO UPDATE "
+                "SET image_key = EXCLUDED.image_key, processing_status = EXCLUDED.processing_status, "
+                "search_timestamp = EXCLUDED.search_timestamp",
+                (face_id, image_key, now, 'processed', search_timestamp)
+            ),
+            
+            # Store original results
+            cursor.mogrify(
+                "INSERT INTO raw_results (face_id, result_type, raw_data, timestamp) VALUES (%s, %s, %s, %s)",
+                (face_id, 'face_search', json.dumps(result_data.get('original_results', [])), now)
+            ),
+        ]
+        
+        # Store identity matches with one multi-row insert
+        if matches:
+            rows = b",".join(
+                cursor.mogrify(
+                    "(%s, %s, %s, %s, %s, %s)",
+                    (
+                        face_id,
+                        match.get('url'),
+                        match.get('score'),
+                        match.get('source_type'),
+                        thumbnail_key,
+                        match_scraped_data
+                    )
+                )
+                for match, thumbnail_key, match_scraped_data in zip(matches, thumbnail_keys, scraped_data)
+            )
+            statements.append(
+                b"INSERT INTO identity_matches (face_id, url, score, source_type, thumbnail_key, scraped_data) VALUES "
+                + rows
             )
-        )
         
-        # Store original results
+        cursor.execute(b";\n".join(statements))
+    
+    prime_identity_cache(face_id, matches, thumbnail_keys, scraped_data)
+
+def save_stage_timings(face_id, timings, job_id=None):
+    """
+    Merge per-stage pipeline timings into the job row and, if it exists, the face row
+    
+    The face row is only written once the face search succeeds, so the timings
+    of a failed search are kept on the job.
+    
+    Args:
+        face_id: Face ID the timings belong to
+        timings: Dictionary of timing info keyed by stage name
+        job_id: Job the stages ran for, if any
+        
+    Returns:
+        True if the timings were stored on at least one row
+    """
+    timings_json = json.dumps(timings)
+    with get_db_cursor() as cursor:
         cursor.execute(
-            "INSERT INTO raw_results (face_id, result_type, raw_data, timestamp) "
-            "VALUES (%s, %s, %s, %s)",
-            (
-                face_id, 
-                'face_search', 
-                json.dumps(result_data.get('original_results', [])), 
-                datetime.datetime.now()
-            )
+            "UPDATE faces SET stage_timings = COALESCE(stage_timings, '{}'::jsonb) || %s::jsonb "
+            "WHERE face_id = %s",
+            (timings_json, face_id)
         )
+        updated = cursor.rowcount
         
-        # Store identity matches
-        for match in result_data.get('identity_analyses', []):
+        if job_id is not None:
             cursor.execute(
-                "INSERT INTO identity_matches (face_id, url, score, source_type, thumbnail_base64, scraped_data) "
-                "VALUES (%s, %s, %s, %s, %s, %s)",
-                (
-                    face_id, 
-                    match.get('url'), 
-                    match.get('score'), 
-                    match.get('source_type'), 
-                    match.get('thumbnail_base64'), 
-                    json.dumps(match.get('scraped_data', {}))
-                )
+                "UPDATE jobs SET stage_timings = COALESCE(stage_timings, '{}'::jsonb) || %s::jsonb "
+                "WHERE id = %s",
+                (timings_json, job_id)
             )
+            updated += cursor.rowcount
+    
+    return updated > 0
+
+def _search_names_array(search_names):
+    """Convert search names to a list for a TEXT[] column (None if there are none)"""
+    if not search_names:
+        return None
+    if isinstance(search_names, list):
+        return search_names
+    # Convert single string to single-item array
+    return [search_names]
 
 def save_bio(face_id, bio_text, record_data=None, search_names=None):
-    """Save generated bio and record data to the database."""
+    """
+    Save generated bio and record data to the database
+    
+    A single upsert on the unique face_id: the bio always replaces the stored
+    one, while record data, search names and full name are only written when
+    supplied, so a concurrent records stage can't be overwritten with NULLs.
+    """
+    search_names_array = _search_names_array(search_names)
+    
+    # Get the full name from the first search name
+    full_name = search_names_array[0] if search_names_array else None
+    now = datetime.datetime.now()
+    
     with get_db_cursor() as cursor:
-        # Check if a profile exists for this face
-        cursor.execute("SELECT id FROM person_profiles WHERE face_id = %s", (face_id,))
-        profile_exists = cursor.fetchone()
-        
-        # Convert search_names to proper PostgreSQL array format
-        if search_names:
-            if isinstance(search_names, list):
-                search_names_array = search_names
-            else:
-                search_names_array = [search_names]
-        else:
-            search_names_array = None
-            
-        # Get the full name from record data or first search name
-        full_name = None
-        if search_names_array and len(search_names_array) > 0:
-            full_name = search_names_array[0]
-        
-        if profile_exists:
-            # Build update SQL parts conditionally to avoid empty parameters
-            sql_parts = ["UPDATE person_profiles SET bio_text = %s, bio_timestamp = %s"]
-            params = [bio_text, datetime.datetime.now()]
-            
-            if record_data:
-                sql_parts.append(", record_data = %s, record_timestamp = %s")
-                params.extend([json.dumps(record_data), datetime.datetime.now()])
-                
-            if search_names_array:
-                sql_parts.append(", record_search_names = %s")
-                params.append(search_names_array)
-                
-            if full_name:
-                sql_parts.append(", full_name = %s")
-                params.append(full_name)
-                
-            # Add WHERE clause
-            sql_parts.append(" WHERE face_id = %s")
-            params.append(face_id)
-            
-            # Execute the constructed query
-            cursor.execute(" ".join(sql_parts), params)
-        else:
-            # For new profiles, only include non-null fields
-            fields = ["face_id", "bio_text", "bio_timestamp"]
-            values = ["%s", "%s", "%s"]
-            params = [face_id, bio_text, datetime.datetime.now()]
-            
-            if record_data:
-                fields.extend(["record_data", "record_timestamp"])
-                values.extend(["%s", "%s"])
-                params.extend([json.dumps(record_data), datetime.datetime.now()])
-                
-            if search_names_array:
-                fields.append("record_search_names")
-                values.append("%s")
-                params.append(search_names_array)
-                
-            if full_name:
-                fields.append("full_name")
-                values.append("%s")
-                params.append(full_name)
-                
-            # Construct the INSERT query
-            query = f"INSERT INTO person_profiles ({', '.join(fields)}) VALUES ({', '.join(values)})"
-            cursor.execute(query, params)
+        cursor.execute(
+            """
+            INSERT INTO person_profiles
+                (face_id, bio_text, bio_timestamp, record_data, record_timestamp, record_search_names, full_name)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (face_id) DO UPDATE SET
+                bio_text = EXCLUDED.bio_text,
+                bio_timestamp = EXCLUDED.bio_timestamp,
+                record_data = COALESCE(EXCLUDED.record_data, person_profiles.record_data),
+                record_timestamp = COALESCE(EXCLUDED.record_timestamp, person_profiles.record_timestamp),
+                record_search_names = COALESCE(EXCLUDED.record_search_names, person_profiles.record_search_names),
+                full_name = COALESCE(EXCLUDED.full_name, person_profiles.full_name)
+            """,
+            (
+                face_id,
+                bio_text,
+                now,
+                json.dumps(record_data) if record_data else None,
+                now if record_data else None,
+                search_names_array,
+                full_name
+            )
+        )
 
-def get_face_result(face_id):
-    """Get face search results from the database."""
-    with get_db_cursor() as cursor:
-        # Get face record
-        cursor.execute("SELECT * FROM faces WHERE face_id = %s", (face_id,))
+# Column lists for the per-face reads. Thumbnails are only selected by the
+# readers that return them; everything else reads IDENTITY_SUMMARY_COLUMNS.
+IDENTITY_SUMMARY_COLUMNS = "url, score, source_type, scraped_data"
+IDENTITY_ANALYSIS_COLUMNS = IDENTITY_SUMMARY_COLUMNS + ", thumbnail_base64, thumbnail_key"
+
+# Reads a face's whole result document in one round trip
+FACE_RESULT_QUERY = f"""
+    SELECT f.image_base64, f.image_key, f.search_timestamp,
+           m.matches, r.raw_data,
+           p.face_id IS NOT NULL AS has_profile,
+           p.bio_text, p.bio_timestamp, p.record_data, p.record_search_names
+    FROM faces f
+    LEFT JOIN LATERAL (
+        SELECT COALESCE(json_agg(row_to_json(im) ORDER BY im.id), '[]'::json) AS matches
+        FROM (
+            SELECT id, {IDENTITY_ANALYSIS_COLUMNS}
+            FROM identity_matches WHERE face_id = f.face_id
+        ) im
+    ) m ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT raw_data FROM raw_results
+        WHERE face_id = f.face_id AND result_type = 'face_search'
+        ORDER BY id DESC LIMIT 1
+    ) r ON TRUE
+    LEFT JOIN person_profiles p ON p.face_id = f.face_id
+    WHERE f.face_id = %s
+"""
+
+def get_face_result(face_id, include_images=False):
+    """
+    Get face search results from the database
+    
+    The face row, its identity matches (aggregated with json_agg), the face
+    search raw results and the profile come back from a single query, so
+    the whole document costs one round trip.
+    
+    Images are returned as blob keys (`source_image_key`, `thumbnail_key`);
+    their base64 is only fetched from the blob store when include_images is set.
+    Rows saved before the blob store keep returning their inline base64.
+    
+    Args:
+        face_id: Face ID to look up
+        include_images: Whether to fetch and inline image bytes as base64
+        
+    Returns:
+        Result dictionary, or None if the face has no results
+    """
+    with get_db_cursor(named=True) as cursor:
+        cursor.execute(FACE_RESULT_QUERY, (face_id,))
         face = cursor.fetchone()
-        if not face:
-            return None
+    
+    if not face:
+        return None
+    return build_face_result(face_id, face, include_images)
+
+def build_face_result(face_id, face, include_images=False):
+    """
+    Build the result document from a FACE_RESULT_QUERY row
+    
+    Args:
+        face_id: Face ID the row belongs to
+        face: Row with columns accessible by name
+        include_images: Whether to fetch and inline image bytes as base64
         
-        # Get identity matches
-        cursor.execute("SELECT * FROM identity_matches WHERE face_id = %s", (face_id,))
-        identity_matches = cursor.fetchall()
+    Returns:
+        Result dictionary
+    """
+    # Build result object in the same format as the original JSON
+    result = {
+        "face_id": face_id,
+        "source_image_key": face["image_key"],
+        "source_image_base64": _image_base64(face["image_key"], face["image_base64"], include_images),
+        "search_timestamp": _format_timestamp(face["search_timestamp"]),
+        "identity_analyses": [],
+        "original_results": face["raw_data"] if face["raw_data"] is not None else []
+    }
+    
+    # Add identity analyses
+    for match in face["matches"]:
+        analysis = _identity_summary(match)
+        analysis["thumbnail_key"] = match["thumbnail_key"]
+        analysis["thumbnail_base64"] = _image_base64(
+            match["thumbnail_key"], match["thumbnail_base64"], include_images, data_url=True
+        )
+        result["identity_analyses"].append(analysis)
+    
+    # Add bio and record data if available
+    if face["has_profile"]:
+        result["bio_text"] = face["bio_text"]
+        result["bio_timestamp"] = _format_timestamp(face["bio_timestamp"])
+        result["record_analyses"] = face["record_data"]
+        result["record_search_names"] = face["record_search_names"]
+    
+    return result
+
+def _format_timestamp(value):
+    """Format a database timestamp the same way as the stored results"""
+    return value.strftime("%Y%m%d_%H%M%S") if value else None
+
+def get_face_status(face_id):
+    """
+    Get a face's processing status without loading its images or matches
+    
+    Uses a single query over the latest job for the face, the faces row and
+    the person profile, all looked up by indexed face_id.
+    
+    Args:
+        face_id: Face ID to look up
         
-        # Get raw results
-        cursor.execute("SELECT * FROM raw_results WHERE face_id = %s AND result_type = 'face_search'", (face_id,))
-        raw_results = cursor.fetchone()
-        
-        # Get bio and record data
-        cursor.execute("SELECT * FROM person_profiles WHERE face_id = %s", (face_id,))
-        profile = cursor.fetchone()
-        
-        # Build result object in the same format as the original JSON
-        result = {
-            "face_id": face_id,
-            "source_image_base64": face[2],
-            "search_timestamp": face[5].strftime("%Y%m%d_%H%M%S") if face[5] else None,
-            "identity_analyses": [],
-            "original_results": raw_results[3] if raw_results else []
+    Returns:
+        Status dictionary, or None if the face is unknown
+    """
+    with get_db_cursor(named=True) as cursor:
+        cursor.execute(
+            """
+            SELECT j.status AS job_status, j.attempts, j.max_attempts, j.last_error, j.created_at, j.updated_at,
+                   f.face_id IS NOT NULL AS has_result, f.processing_status, f.search_timestamp,
+                   COALESCE(f.stage_timings, '{}'::jsonb) || COALESCE(j.stage_timings, '{}'::jsonb) AS stage_timings,
+                   p.bio_timestamp, p.record_timestamp
+            FROM (SELECT %s::text AS face_id) k
+            LEFT JOIN LATERAL (
+                SELECT status, attempts, max_attempts, last_error, created_at, updated_at, stage_timings
+                FROM jobs WHERE face_id = k.face_id
+                ORDER BY id DESC LIMIT 1
+            ) j ON TRUE
+            LEFT JOIN faces f ON f.face_id = k.face_id
+            LEFT JOIN LATERAL (
+                SELECT bio_timestamp, record_timestamp
+                FROM person_profiles WHERE face_id = k.face_id
+                ORDER BY id DESC LIMIT 1
+            ) p ON TRUE
+            """,
+            (face_id,)
+        )
+        row = cursor.fetchone()
+    
+    job_status = row["job_status"]
+    has_result = row["has_result"]
+    search_timestamp = row["search_timestamp"]
+    bio_timestamp = row["bio_timestamp"]
+    record_timestamp = row["record_timestamp"]
+    
+    if job_status is None and not has_result:
+        return None
+    
+    # Public status: jobs report their queue state, faces without a job were processed directly
+    status = {
+        JOB_STATUS_QUEUED: "queued",
+        JOB_STATUS_RUNNING: "processing",
+        JOB_STATUS_DONE: "completed",
+        JOB_STATUS_DEAD: "failed",
+    }.get(job_status, "completed" if has_result else job_status)
+    
+    result = {
+        "face_id": face_id,
+        "status": status,
+        "has_result": bool(has_result),
+        "processing_status": row["processing_status"],
+        "search_timestamp": _format_timestamp(search_timestamp),
+        "bio_timestamp": _format_timestamp(bio_timestamp),
+        "record_timestamp": _format_timestamp(record_timestamp),
+        "stages": row["stage_timings"] or {},
+        # Changes whenever the stored result changes; used to build result ETags
+        "result_version": "|".join(
+            str(value) for value in (search_timestamp, bio_timestamp, record_timestamp)
+        ) if has_result else None
+    }
+    
+    if job_status is not None:
+        result["job"] = {
+            "status": job_status,
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "last_error": row["last_error"],
+            "created_at": _format_timestamp(row["created_at"]),
+            "updated_at": _format_timestamp(row["updated_at"])
         }
+    
+    return result
+
+def _identity_summary(match):
+    """Build the analysis dictionary shared by every identity match reader from a named row"""
+    scraped_data = match["scraped_data"]
+    # JSONB normally arrives as a dict already; older rows may hold a JSON string
+    if isinstance(scraped_data, str):
+        scraped_data = json.loads(scraped_data)
+    elif not isinstance(scraped_data, dict):
+        scraped_data = {}
+    
+    return {
+        "url": match["url"],
+        "score": match["score"],
+        "source_type": match["source_type"],
+        "scraped_data": scraped_data
+    }
+
+def configure_identity_cache(max_entries, ttl_seconds):
+    """
+    Resize the identity match cache, dropping its current entries
+    
+    Args:
+        max_entries: Most faces kept (0 disables the cache)
+        ttl_seconds: Seconds a face's cached matches stay valid
+    """
+    global _identity_cache
+    _identity_cache = TTLCache(max_entries, ttl_seconds)
+
+def identity_cache_stats():
+    """Get the identity match cache's size and hit/miss counters"""
+    return _identity_cache.stats()
+
+def invalidate_identity_cache(face_id):
+    """Forget a face's cached identity matches"""
+    _identity_cache.invalidate(("summaries", face_id), ("analyses", face_id))
+
+def prime_identity_cache(face_id, matches, thumbnail_keys, scraped_data):
+    """
+    Cache the identity matches just saved for a face, as the readers would return them
+    
+    Args:
+        face_id: Face ID the matches belong to
+        matches: Identity analyses passed to save_face_result
+        thumbnail_keys: Blob key of each match's thumbnail
+        scraped_data: Each match's scraped data as the JSON string that was stored
+    """
+    # Empty results aren't cached, as on the read path, so a later save is seen at once
+    if not _identity_cache.enabled or not matches:
+        return
+    
+    summaries = []
+    analyses = []
+    for match, thumbnail_key, match_scraped_data in zip(matches, thumbnail_keys, scraped_data):
+        score = match.get('score')
+        summary = _identity_summary({
+            "url": match.get('url'),
+            "score": float(score) if score is not None else None,
+            "source_type": match.get('source_type'),
+            # Decoded from the stored JSON so it matches what the database returns
+            "scraped_data": json.loads(match_scraped_data)
+        })
+        summaries.append(summary)
+        analyses.append(dict(summary, thumbnail_base64=None, thumbnail_key=thumbnail_key))
+    
+    _identity_cache.put(("summaries", face_id), summaries)
+    _identity_cache.put(("analyses", face_id), analyses)
+
+def get_identity_summaries(face_id):
+    """
+    Get a face's identity matches without thumbnails
+    
+    This is what NameResolver, BioGenerator and RecordChecker need: names come
+    from the scraped data, so the thumbnail columns are never read. Served
+    from the identity cache when the face's results were saved recently.
+    
+    Args:
+        face_id: Face ID to look up
         
-        # Add identity analyses
-        for match in identity_matches:
-            result["identity_analyses"].append({
-                "url": match[2],
-                "score": match[3],
-                "source_type": match[4],
-                "thumbnail_base64": match[5],
-                "scraped_data": match[6]
-            })
-        
-        # Add bio and record data if available
-        if profile:
-            result["bio_text"] = profile[3]
-            result["bio_timestamp"] = profile[4].strftime("%Y%m%d_%H%M%S") if profile[4] else None
-            result["record_analyses"] = profile[5]
-            result["record_search_names"] = profile[7]
-        
-        return result
+    Returns:
+        List of analyses with url, score, source_type and scraped_data
+    """
+    cached = _identity_cache.get(("summaries", face_id))
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    with get_db_cursor(named=True) as cursor:
+        cursor.execute(
+            f"SELECT {IDENTITY_SUMMARY_COLUMNS} FROM identity_matches WHERE face_id = %s ORDER BY id",
+            (face_id,)
+        )
+        summaries = [_identity_summary(match) for match in cursor.fetchall()]
     
+    # Empty results aren't cached so a face still being searched is re-read
+    if summaries:
+        _identity_cache.put(("summaries", face_id), copy.deepcopy(summaries))
+    return summaries
+
 def get_identity_analyses(face_id):
-    """Get properly formatted identity analyses for NameResolver"""
-    with get_db_cursor() as cursor:
-        # Get identity matches
-        cursor.execute("SELECT * FROM identity_matches WHERE face_id = %s", (face_id,))
+    """
+    Get identity analyses including their thumbnail references
+    
+    Thumbnails stay in the blob store; fetch one with get_image(thumbnail_key)
+    if needed. Callers that only need names should use get_identity_summaries.
+    Served from the identity cache when the face's results were saved recently.
+    """
+    cached = _identity_cache.get(("analyses", face_id))
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    with get_db_cursor(named=True) as cursor:
+        cursor.execute(
+            f"SELECT {IDENTITY_ANALYSIS_COLUMNS} FROM identity_matches WHERE face_id = %s ORDER BY id",
+            (face_id,)
+        )
         identity_matches = cursor.fetchall()
-        
-        analyses = []
-        for match in identity_matches:
-            # The scraped_data is already a Python dict from the JSONB field
-            # Don't try to parse it again with json.loads()
-            if match[6] is not None:
-                if isinstance(match[6], dict):
-                    # Already a dict, use directly
-                    scraped_data = match[6]
-                elif isinstance(match[6], str):
-                    # String that needs to be parsed
-                    scraped_data = json.loads(match[6])
-                else:
-                    # Fallback
-                    scraped_data = {}
-            else:
-                scraped_data = {}
-            
-            analyses.append({
-                "url": match[2],
-                "score": match[3],
-                "source_type": match[4],
-                "thumbnail_base64": match[5],
-                "scraped_data": scraped_data  # Now correctly handled
-            })
-        
-        return analyses
+    
+    analyses = []
+    for match in identity_matches:
+        analysis = _identity_summary(match)
+        analysis["thumbnail_base64"] = match["thumbnail_base64"]
+        analysis["thumbnail_key"] = match["thumbnail_key"]
+        analyses.append(analysis)
+    
+    if analyses:
+        _identity_cache.put(("analyses", face_id), copy.deepcopy(analyses))
+    return analyses
 
 def get_bio_text(face_id):
     """Get bio text for a face ID"""
@@ -623,36 +1284,444 @@ def get_record_analyses(face_id):
         return None
 
 def save_record_data(face_id, record_data, search_names=None):
-    """Save record data to the database"""
+    """
+    Save record data to the database
+    
+    A single upsert on the unique face_id that leaves the bio columns alone,
+    so it is safe to run concurrently with the bio stage.
+    """
     with get_db_cursor() as cursor:
-        # Convert search_names to a proper PostgreSQL array format
-        if search_names:
-            # If it's already a list, convert to PostgreSQL array format
-            if isinstance(search_names, list):
-                # PostgreSQL expects array literals as: '{item1,item2,...}'
-                search_names_array = search_names
-            else:
-                # Convert single string to single-item array
-                search_names_array = [search_names]
-        else:
-            search_names_array = None
-            
-        # Check if a profile exists for this face
-        cursor.execute("SELECT id FROM person_profiles WHERE face_id = %s", (face_id,))
-        profile_exists = cursor.fetchone()
+        cursor.execute(
+            """
+            INSERT INTO person_profiles (face_id, record_data, record_timestamp, record_search_names)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (face_id) DO UPDATE SET
+                record_data = EXCLUDED.record_data,
+                record_timestamp = EXCLUDED.record_timestamp,
+                record_search_names = COALESCE(EXCLUDED.record_search_names, person_profiles.record_search_names)
+            """,
+            (face_id, json.dumps(record_data), datetime.datetime.now(), _search_names_array(search_names))
+        )
+
+# Scrape result cache (see scrape_cache.py)
+
+def get_scrape_cache_entry(source, url_key):
+    """
+    Look up an unexpired cached scrape
+    
+    Args:
+        source: Scraper the result came from
+        url_key: Normalized URL
         
-        if profile_exists:
-            # Update existing profile
-            cursor.execute(
-                "UPDATE person_profiles SET record_data = %s, record_timestamp = %s, record_search_names = %s WHERE face_id = %s",
-                (json.dumps(record_data), datetime.datetime.now(), search_names_array, face_id)
+    Returns:
+        Dictionary with success and data, or None if nothing unexpired is cached
+    """
+    with get_db_cursor(named=True) as cursor:
+        cursor.execute(
+            "SELECT success, data FROM scrape_cache "
+            "WHERE source = %s AND url_key = %s AND expires_at > NOW()",
+            (source, url_key)
+        )
+        return cursor.fetchone()
+
+def save_scrape_cache_entry(source, url_key, data, ttl_seconds):
+    """
+    Cache a scrape result, replacing any earlier one for the URL
+    
+    Args:
+        source: Scraper the result came from
+        url_key: Normalized URL
+        data: Scraped data, or None for a failed scrape
+        ttl_seconds: Seconds until the entry expires
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO scrape_cache (source, url_key, success, data, fetched_at, expires_at)
+            VALUES (%s, %s, %s, %s, NOW(), NOW() + make_interval(secs => %s))
+            ON CONFLICT (source, url_key) DO UPDATE SET
+                success = EXCLUDED.success,
+                data = EXCLUDED.data,
+                fetched_at = EXCLUDED.fetched_at,
+                expires_at = EXCLUDED.expires_at
+            """,
+            (
+                source,
+                url_key,
+                data is not None,
+                json.dumps(data, default=str) if data is not None else None,
+                float(ttl_seconds)
             )
-        else:
-            # Create new profile
+        )
+
+def prune_scrape_cache(limit=1000):
+    """
+    Delete a batch of expired scrape cache entries
+    
+    Args:
+        limit: Most entries deleted in one call
+        
+    Returns:
+        Number of entries deleted
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM scrape_cache WHERE (source, url_key) IN ("
+            "SELECT source, url_key FROM scrape_cache WHERE expires_at <= NOW() LIMIT %s)",
+            (limit,)
+        )
+        return cursor.rowcount
+
+# Durable job queue
+#
+# Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED so any number of
+# workers, in any number of processes or containers, can pull from the same
+# table without handing the same job to two of them. A claimed job holds a
+# lease; if its worker dies the lease expires and another worker reclaims it.
+# Failed jobs are retried with exponential backoff until max_attempts, after
+# which they are left in the 'dead' state for inspection.
+
+class JobQueueFullError(Exception):
+    """Raised when a job would take the queue past its maximum of pending jobs"""
+
+
+def _check_queue_capacity(cursor, job_type, max_pending):
+    """
+    Raise JobQueueFullError if max_pending jobs are already queued or running
+    
+    Runs on the caller's transaction under an advisory lock held until it
+    commits, so concurrent enqueues can't both take the last free place.
+    The count stops at max_pending, so it reads at most that many index
+    entries however long the backlog is.
+    """
+    if max_pending is None:
+        return
+    
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", ("eyespy_job_capacity:" + job_type,))
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM jobs
+            WHERE job_type = %s AND status IN ('queued', 'running')
+            LIMIT %s
+        ) pending
+        """,
+        (job_type, max_pending)
+    )
+    pending = cursor.fetchone()[0]
+    if pending >= max_pending:
+        raise JobQueueFullError(f"Job queue is full ({pending} jobs pending)")
+
+def _insert_job(cursor, face_id, payload, image_data, job_type, max_attempts, content_hash=None, image_phash=None):
+    """Insert a queued job and notify listening workers (on the caller's transaction)"""
+    cursor.execute(
+        "INSERT INTO jobs (face_id, job_type, status, payload, image_data, max_attempts, content_hash, image_phash) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
+        (
+            face_id,
+            job_type,
+            JOB_STATUS_QUEUED,
+            json.dumps(payload or {}),
+            psycopg2.Binary(image_data) if image_data is not None else None,
+            max_attempts,
+            content_hash,
+            image_phash
+        )
+    )
+    job_id = cursor.fetchone()[0]
+    
+    # Delivered to listeners when the transaction commits
+    cursor.execute("SELECT pg_notify(%s, %s)", (JOB_CHANNEL, job_type))
+    return job_id
+
+def enqueue_job(face_id, payload=None, image_data=None, job_type=JOB_TYPE_FACE_PIPELINE, max_attempts=5,
+                max_pending=None):
+    """
+    Add a job to the queue and notify listening workers
+    
+    Args:
+        face_id: Face ID the job processes
+        payload: Optional JSON-serializable job parameters
+        image_data: Optional raw image bytes for the job
+        job_type: Job type (default: face_pipeline)
+        max_attempts: Attempts before the job is dead-lettered
+        max_pending: Most jobs queued or running before new ones are refused (None for no limit)
+        
+    Returns:
+        The new job ID
+        
+    Raises:
+        JobQueueFullError: If max_pending jobs are already pending
+    """
+    with get_db_cursor() as cursor:
+        _check_queue_capacity(cursor, job_type, max_pending)
+        return _insert_job(cursor, face_id, payload, image_data, job_type, max_attempts)
+
+def enqueue_unique_job(face_id, content_hash, payload=None, image_data=None, job_type=JOB_TYPE_FACE_PIPELINE,
+                       max_attempts=5, window_seconds=600, image_phash=None, phash_distance=0,
+                       max_pending=None):
+    """
+    Add a job unless the same image was queued recently
+    
+    A job created within `window_seconds` that is queued, running or done
+    counts as a duplicate if it has the same content hash or, when
+    `image_phash` is given, a perceptual hash within `phash_distance` bits.
+    The check and insert run under an advisory lock so a burst of identical
+    uploads across processes creates exactly one job. Queue capacity is only
+    checked when a new job is about to be inserted, so a duplicate is always
+    attached to its existing job, even while the queue is full.
+    
+    Args:
+        face_id: Face ID for a new job
+        content_hash: SHA-256 of the image bytes
+        payload: Optional JSON-serializable job parameters
+        image_data: Optional raw image bytes for the job
+        job_type: Job type (default: face_pipeline)
+        max_attempts: Attempts before the job is dead-lettered
+        window_seconds: How far back to look for duplicates
+        image_phash: Optional perceptual hash of the image
+        phash_distance: Maximum differing bits for a perceptual match
+        max_pending: Most jobs queued or running before new ones are refused (None for no limit)
+        
+    Returns:
+        Dictionary with the job_id and face_id of the new or existing job,
+        and duplicate=True if an existing job was reused
+        
+    Raises:
+        JobQueueFullError: If the image is new and max_pending jobs are already pending
+    """
+    with get_db_cursor() as cursor:
+        # Perceptual matches can have different content hashes, so they share one lock
+        lock_key = "eyespy_dedup" if image_phash is not None else content_hash
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (lock_key,))
+        
+        cursor.execute(
+            """
+            SELECT id, face_id FROM jobs
+            WHERE content_hash = %s AND job_type = %s
+              AND status IN ('queued', 'running', 'done')
+              AND created_at > NOW() - make_interval(secs => %s)
+            ORDER BY id DESC LIMIT 1
+            """,
+            (content_hash, job_type, window_seconds)
+        )
+        row = cursor.fetchone()
+        
+        if row is None and image_phash is not None:
+            # Count differing bits by XORing the hashes and counting the ones in the bit string
             cursor.execute(
-                "INSERT INTO person_profiles (face_id, record_data, record_timestamp, record_search_names) VALUES (%s, %s, %s, %s)",
-                (face_id, json.dumps(record_data), datetime.datetime.now(), search_names_array)
+                """
+                SELECT id, face_id FROM jobs
+                WHERE job_type = %s
+                  AND created_at > NOW() - make_interval(secs => %s)
+                  AND status IN ('queued', 'running', 'done')
+                  AND image_phash IS NOT NULL
+                  AND length(replace((image_phash # %s)::bit(64)::text, '0', '')) <= %s
+                ORDER BY id DESC LIMIT 1
+                """,
+                (job_type, window_seconds, image_phash, phash_distance)
+            )
+            row = cursor.fetchone()
+        
+        if row is not None:
+            return {"job_id": row[0], "face_id": row[1], "duplicate": True}
+        
+        _check_queue_capacity(cursor, job_type, max_pending)
+        job_id = _insert_job(cursor, face_id, payload, image_data, job_type, max_attempts, content_hash, image_phash)
+        return {"job_id": job_id, "face_id": face_id, "duplicate": False}
+
+def claim_jobs(worker_id, limit=1, lease_seconds=600, job_type=JOB_TYPE_FACE_PIPELINE):
+    """
+    Claim up to `limit` runnable jobs for this worker
+    
+    A job is runnable if it is queued and due, or if it is running but its
+    lease has expired (its worker died) and it still has attempts left.
+    
+    Args:
+        worker_id: Identifier of the claiming worker
+        limit: Maximum number of jobs to claim
+        lease_seconds: How long the claim is valid without a heartbeat
+        job_type: Job type to claim
+        
+    Returns:
+        List of job dictionaries
+    """
+    if limit <= 0:
+        return []
+    
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """
+            WITH claimable AS (
+                SELECT id FROM jobs
+                WHERE job_type = %s
+                  AND (
+                    (status = 'queued' AND run_after <= NOW())
+                    OR (status = 'running' AND lease_expires_at < NOW() AND attempts < max_attempts)
+                  )
+                ORDER BY run_after, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
             )
+            UPDATE jobs
+            SET status = 'running',
+                locked_by = %s,
+                lease_expires_at = NOW() + make_interval(secs => %s),
+                attempts = jobs.attempts + 1,
+                updated_at = NOW()
+            FROM claimable
+            WHERE jobs.id = claimable.id
+            RETURNING jobs.id, jobs.face_id, jobs.payload, jobs.image_data, jobs.attempts, jobs.max_attempts
+            """,
+            (job_type, limit, worker_id, lease_seconds)
+        )
+        
+        jobs = []
+        for row in cursor.fetchall():
+            jobs.append({
+                "id": row[0],
+                "face_id": row[1],
+                "payload": row[2] or {},
+                "image_data": bytes(row[3]) if row[3] is not None else None,
+                "attempts": row[4],
+                "max_attempts": row[5]
+            })
+        return jobs
+
+def extend_job_leases(job_ids, worker_id, lease_seconds=600):
+    """
+    Heartbeat: extend the leases of jobs this worker is still running
+    
+    Args:
+        job_ids: IDs of jobs held by the worker
+        worker_id: Identifier of the worker holding the leases
+        lease_seconds: New lease length from now
+        
+    Returns:
+        Number of leases extended
+    """
+    if not job_ids:
+        return 0
+    
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE jobs SET lease_expires_at = NOW() + make_interval(secs => %s), updated_at = NOW() "
+            "WHERE id = ANY(%s) AND locked_by = %s AND status = 'running'",
+            (lease_seconds, list(job_ids), worker_id)
+        )
+        return cursor.rowcount
+
+def complete_job(job_id, worker_id):
+    """Mark a job as done and drop its image data"""
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE jobs SET status = 'done', image_data = NULL, locked_by = NULL, "
+            "lease_expires_at = NULL, last_error = NULL, updated_at = NOW() "
+            "WHERE id = %s AND locked_by = %s",
+            (job_id, worker_id)
+        )
+
+def fail_job(job_id, worker_id, error, retry_base_seconds=30, retry_max_seconds=3600):
+    """
+    Record a failed attempt, scheduling a retry with exponential backoff
+    or dead-lettering the job once it has used all its attempts
+    
+    Args:
+        job_id: Job ID
+        worker_id: Identifier of the worker holding the job
+        error: Error message to record
+        retry_base_seconds: Delay before the first retry
+        retry_max_seconds: Upper bound on the retry delay
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                run_after = NOW() + make_interval(secs => LEAST(%s * power(2, GREATEST(attempts - 1, 0)), %s)),
+                locked_by = NULL,
+                lease_expires_at = NULL,
+                last_error = %s,
+                updated_at = NOW()
+            WHERE id = %s AND locked_by = %s
+            """,
+            (retry_base_seconds, retry_max_seconds, str(error)[:2000], job_id, worker_id)
+        )
+
+def release_jobs(job_ids, worker_id):
+    """
+    Return unfinished jobs to the queue without counting the attempt,
+    used when a worker shuts down cleanly with work still in progress
+    """
+    if not job_ids:
+        return 0
+    
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE jobs SET status = 'queued', attempts = GREATEST(attempts - 1, 0), run_after = NOW(), "
+            "locked_by = NULL, lease_expires_at = NULL, updated_at = NOW() "
+            "WHERE id = ANY(%s) AND locked_by = %s AND status = 'running'",
+            (list(job_ids), worker_id)
+        )
+        released = cursor.rowcount
+        if released:
+            cursor.execute("SELECT pg_notify(%s, %s)", (JOB_CHANNEL, JOB_TYPE_FACE_PIPELINE))
+        return released
+
+def dead_letter_expired_jobs():
+    """Move jobs whose lease expired on their final attempt to the dead state"""
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "UPDATE jobs SET status = 'dead', locked_by = NULL, lease_expires_at = NULL, "
+            "last_error = COALESCE(last_error, 'Lease expired on final attempt'), updated_at = NOW() "
+            "WHERE status = 'running' AND lease_expires_at < NOW() AND attempts >= max_attempts"
+        )
+        return cursor.rowcount
+
+def open_listen_connection(channel=JOB_CHANNEL):
+    """
+    Open a dedicated autocommit connection listening on a notification channel
+    
+    LISTEN needs a long-lived session, so this connection is not taken from the pool.
+    The caller is responsible for closing it.
+    """
+    if _conn_string is None:
+        init_connection_pool()
+    
+    conn = psycopg2.connect(_conn_string)
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f"LISTEN {channel}")
+    return conn
+
+def wait_for_notifications(conn, timeout):
+    """
+    Block until a notification arrives on a listen connection or the timeout passes
+    
+    Args:
+        conn: Connection returned by open_listen_connection
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        List of received notifications (empty on timeout)
+    """
+    if select.select([conn], [], [], timeout) == ([], [], []):
+        return []
+    
+    conn.poll()
+    notifications = list(conn.notifies)
+    del conn.notifies[:]
+    return notifications
+
+def notify_event(payload):
+    """
+    Broadcast a pipeline event to other processes listening on the event channel
+    
+    Args:
+        payload: JSON string (Postgres limits notification payloads to 8000 bytes)
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", (EVENT_CHANNEL, payload))
 
 class JSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle datetime objects."""
@@ -673,13 +1742,20 @@ def validate_database_connection():
             if result and result[0] == 1:
                 print("DATABASE CONNECTION TEST: SUCCESS")
                 
-                # Try to count rows in critical tables
+                # Check the critical tables exist, using the planner's row estimate
+                # rather than COUNT(*), which would scan every table on startup
                 tables = ["faces", "identity_matches", "person_profiles", "raw_results"]
                 for table in tables:
                     try:
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
-                        print(f"Table '{table}' exists and has {count} rows")
+                        cursor.execute(
+                            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                            (table,)
+                        )
+                        row = cursor.fetchone()
+                        if row is None:
+                            print(f"Table '{table}' does not exist")
+                        else:
+                            print(f"Table '{table}' exists and has about {max(row[0], 0)} rows")
                     except Exception as e:
                         print(f"Error accessing table '{table}': {e}")
                 
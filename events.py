@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+events.py - In-process pub/sub for pipeline progress events
+
+The controller publishes stage transitions and FaceCheck search progress for
+each face, and the web server streams them to clients subscribed to that
+face. Each subscriber gets its own bounded queue, so a slow client can only
+lose its own oldest events and never blocks the pipeline.
+"""
+
+import queue
+import threading
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger("Events")
+
+# Event types
+EVENT_STATUS = "status"
+EVENT_STAGE = "stage"
+EVENT_PROGRESS = "progress"
+EVENT_COMPLETE = "complete"
+
+
+class SubscriberLimitError(Exception):
+    """Raised by EventBus.subscribe when the process already has its maximum of subscribers"""
+
+
+class Subscription:
+    """A subscriber's queue of events for one face"""
+
+    def __init__(self, face_id: str, max_queue_size: int = 100):
+        self.face_id = face_id
+        self.queue = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self.dropped = 0
+
+    def put(self, event: Dict[str, Any]):
+        """Queue an event, dropping the oldest one if the subscriber has fallen behind"""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            The next event, or None if the timeout passed
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """Routes published events to the subscribers of the event's face"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self.subscriber_count = 0
+        self.published = 0
+        self.rejected = 0
+
+    def subscribe(self, face_id: str, max_queue_size: int = 100,
+                  max_subscribers: Optional[int] = None) -> Subscription:
+        """
+        Subscribe to events for a face
+
+        Args:
+            face_id: Face ID to receive events for
+            max_queue_size: Events buffered for this subscriber before the oldest are dropped
+            max_subscribers: Most subscriptions open at once across all faces (None for no limit)
+
+        Returns:
+            Subscription to read events from; pass it to unsubscribe when done
+
+        Raises:
+            SubscriberLimitError: If max_subscribers subscriptions are already open
+        """
+        subscription = Subscription(face_id, max_queue_size)
+        with self.lock:
+            if max_subscribers is not None and self.subscriber_count >= max_subscribers:
+                self.rejected += 1
+                raise SubscriberLimitError(f"{self.subscriber_count} event subscriptions already open")
+            self.subscribers.setdefault(face_id, set()).add(subscription)
+            self.subscriber_count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering events to a subscription (safe to call more than once)"""
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.face_id)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            self.subscriber_count -= 1
+            if not subscribers:
+                del self.subscribers[subscription.face_id]
+
+    def has_subscribers(self, face_id: str) -> bool:
+        """Return True if anyone is listening for a face's events"""
+        with self.lock:
+            return face_id in self.subscribers
+
+    def publish(self, event: Dict[str, Any]):
+        """
+        Deliver an event to the subscribers of its face
+
+        Args:
+            event: Event dictionary with at least "face_id" and "type"
+        """
+        with self.lock:
+            self.published += 1
+            subscribers = list(self.subscribers.get(event.get("face_id"), ()))
+
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get subscriber and event counts
+
+        Returns:
+            Dictionary of bus metrics
+        """
+        with self.lock:
+            return {
+                "faces": len(self.subscribers),
+                "subscribers": self.subscriber_count,
+                "published": self.published,
+                "rejected": self.rejected
+            }
+
+
+def make_event(face_id: str, event_type: str, **data) -> Dict[str, Any]:
+    """
+    Build an event dictionary
+
+    Args:
+        face_id: Face ID the event belongs to
+        event_type: One of the EVENT_* types
+        **data: Event-specific fields
+
+    Returns:
+        Event dictionary
+    """
+    event = {"face_id": face_id, "type": event_type, "timestamp": time.time()}
+    event.update(data)
+    return event
+
+
+# Process-wide bus shared by the controller and the web server
+bus = EventBus()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+http_client.py - Shared HTTP sessions for outbound API calls
+
+Each host gets one requests.Session with its own connection pool, so calls
+to FaceCheckID, Zyte and the records provider reuse kept-alive connections
+instead of opening a new TCP/TLS connection per request. Every request gets
+the same default timeouts unless the caller passes its own, and per-host
+request counts and latencies are kept for /api/metrics.
+
+The controller configures the process-wide client and hands it to FaceUpload
+and RecordChecker; standalone scripts get a default-configured one.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import Histogram
+
+logger = logging.getLogger("HttpClient")
+
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+
+class HostStats:
+    """Request counters and latency histogram for one host"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.status_classes: Dict[str, int] = {}
+        self.latency_seconds = Histogram()
+
+    def record(self, elapsed: float, status_code: Optional[int] = None):
+        """Record one request; status_code is None if it failed without a response"""
+        self.latency_seconds.observe(elapsed)
+        with self.lock:
+            self.requests += 1
+            if status_code is None:
+                self.errors += 1
+            else:
+                status_class = f"{status_code // 100}xx"
+                self.status_classes[status_class] = self.status_classes.get(status_class, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = {
+                "requests": self.requests,
+                "errors": self.errors,
+                "status": dict(self.status_classes)
+            }
+        stats["latency_seconds"] = self.latency_seconds.snapshot()
+        return stats
+
+
+class HttpClient:
+    """Per-host pooled sessions with uniform timeouts and metrics"""
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        """
+        Initialize the client (sessions are created on first use of each host)
+
+        Args:
+            pool_maxsize: Kept-alive connections per host; should cover the number
+                of threads calling that host at once
+            connect_timeout: Default seconds to wait for a connection
+            read_timeout: Default seconds to wait for response data
+        """
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.timeout = (float(connect_timeout), float(read_timeout))
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, requests.Session] = {}
+        self.host_stats: Dict[str, HostStats] = {}
+
+    def _session(self, host: str) -> requests.Session:
+        """Get the session for a scheme://host origin, creating it on first use"""
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # One host per session, so a single pool of pool_maxsize connections
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self.sessions[host] = session
+                self.host_stats.setdefault(host, HostStats())
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request on the host's pooled session
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to requests.Session.request; timeout defaults to
+                the client's (connect, read) timeouts
+
+        Returns:
+            The response
+
+        Raises:
+            requests.RequestException: If the request fails without a response
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self._session(host)
+        kwargs.setdefault("timeout", self.timeout)
+
+        start_time = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.host_stats[host].record(time.monotonic() - start_time)
+            raise
+        self.host_stats[host].record(time.monotonic() - start_time, response.status_code)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request (see request)"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request (see request)"""
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-host request metrics
+
+        Returns:
+            Dictionary keyed by origin with request and error counts, responses
+            by status class and a latency histogram in seconds
+        """
+        with self.lock:
+            host_stats = dict(self.host_stats)
+        return {host: stats.snapshot() for host, stats in host_stats.items()}
+
+    def close(self):
+        """Close every session and its pooled connections"""
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def configure(pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+              connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+              read_timeout: float = DEFAULT_READ_TIMEOUT) -> HttpClient:
+    """
+    Replace the process-wide client
+
+    Args:
+        pool_maxsize: Kept-alive connections per host
+        connect_timeout: Default connect timeout in seconds
+        read_timeout: Default read timeout in seconds
+
+    Returns:
+        The new client
+    """
+    global _client
+
+    client = HttpClient(pool_maxsize, connect_timeout, read_timeout)
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None:
+        previous.close()
+    logger.info(f"HTTP client configured: pool {pool_maxsize}/host, timeouts {connect_timeout}s/{read_timeout}s")
+    return client
+
+
+def get_client() -> HttpClient:
+    """Return the process-wide client, creating a default one on first use"""
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+ids.py - Time-ordered identifiers for faces
+
+Face IDs are UUIDv7 values (RFC 9562): a 48-bit millisecond timestamp
+followed by random bits. They sort by creation time, need no coordination
+between processes, and two uploads in the same millisecond still get
+distinct IDs. Within one process, IDs created in the same millisecond are
+also kept in order by a counter in the random bits.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+FACE_ID_PREFIX = "face_"
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+# 12-bit rand_a field used as a per-millisecond counter
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a UUIDv7"""
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & (_COUNTER_MAX >> 1)
+        else:
+            # Same (or an earlier, if the clock stepped back) millisecond: keep increasing
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms = _last_ms
+        counter = _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76          # version
+    value |= counter << 64
+    value |= 0b10 << 62         # RFC 4122 variant
+    value |= rand_b
+    return uuid.UUID(int=value)
+
+
+def new_face_id() -> str:
+    """Generate a new face ID, e.g. face_01890a5d-ac96-774b-bcce-b302099a8057"""
+    return f"{FACE_ID_PREFIX}{uuid7()}"
+
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+image_hash.py - Content hashes used to recognize duplicate face uploads
+
+SHA-256 identifies byte-identical uploads. The optional perceptual hash
+(a 64-bit difference hash) also matches the same image after re-encoding
+or resizing; it needs Pillow and is skipped when Pillow is not installed.
+"""
+
+import hashlib
+import io
+import logging
+from typing import Optional
+
+logger = logging.getLogger("ImageHash")
+
+try:
+    from PIL import Image
+    PERCEPTUAL_HASH_AVAILABLE = True
+except ImportError:
+    PERCEPTUAL_HASH_AVAILABLE = False
+
+_HASH_BITS = 64
+
+
+def content_hash(image_data: bytes) -> str:
+    """Return the hex SHA-256 of the image bytes"""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def perceptual_hash(image_data: bytes) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash of an image
+
+    The image is reduced to a 9x8 grayscale thumbnail and each bit records
+    whether a pixel is brighter than its right-hand neighbour.
+
+    Args:
+        image_data: Image bytes
+
+    Returns:
+        The hash as a signed 64-bit integer (so it fits a Postgres BIGINT),
+        or None if Pillow is unavailable or the image can't be decoded
+    """
+    if not PERCEPTUAL_HASH_AVAILABLE:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            pixels = list(image.convert("L").resize((9, 8)).getdata())
+    except Exception as e:
+        logger.warning(f"Could not compute perceptual hash: {e}")
+        return None
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+
+    # Store as signed so it round-trips through BIGINT
+    return value - (1 << _HASH_BITS) if value >= (1 << (_HASH_BITS - 1)) else value
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+metrics.py - Lightweight in-process metrics for /api/metrics
+
+Histograms count observations into fixed cumulative buckets, so they cost a
+lock and a few comparisons per observation and report the same shape no
+matter how many values have been recorded.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+# Bucket upper bounds in seconds, suited to waits and request latencies
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        """
+        Initialize the histogram
+
+        Args:
+            buckets: Ascending bucket upper bounds (default: DEFAULT_LATENCY_BUCKETS)
+        """
+        self.buckets = tuple(sorted(buckets or DEFAULT_LATENCY_BUCKETS))
+        self.lock = threading.Lock()
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the histogram's current state
+
+        Returns:
+            Dictionary with count, sum, mean, max and cumulative bucket counts
+            keyed by upper bound ("+Inf" for the overflow bucket)
+        """
+        with self.lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.sum
+            maximum = self.max
+
+        buckets = {}
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = count
+
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0,
+            "max": round(maximum, 6),
+            "buckets": buckets
+        }
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+pipeline.py - Worker pools for the EyeSpy processing pipeline
+
+This module provides the bounded work queue used by the controller to run
+pipeline stages in the background. Each pool owns a fixed number of worker
+threads that block on the queue, so an idle pool costs nothing and a full
+pool rejects new work instead of growing without limit.
+"""
+
+import queue
+import threading
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("Pipeline")
+
+# Sentinel placed on the queue to tell a worker thread to exit
+_STOP = object()
+
+
+class QueueFullError(Exception):
+    """Raised when a stage pool has no room left for another item"""
+
+
+class StagePool:
+    """
+    Bounded queue with a fixed set of worker threads
+
+    Items submitted to the pool are handed to ``handler`` by one of the
+    worker threads. Workers block on the queue while it is empty, and
+    ``submit`` fails fast with QueueFullError when the backlog is full.
+    An item counts as failed if the handler raises or returns False.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[bool]], workers: int = 1,
+                 max_queue_size: int = 100):
+        """
+        Initialize the pool (threads are not started until start() is called)
+
+        Args:
+            name: Stage name, used for thread names and logging
+            handler: Callable invoked with each submitted item; returning False
+                reports the item as failed
+            workers: Number of worker threads
+            max_queue_size: Maximum number of items waiting in the queue
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self.threads: List[threading.Thread] = []
+        self.started = False
+        self.lock = threading.Lock()
+        
+        # Counters reported by stats()
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.active = 0
+
+    def start(self):
+        """Start the worker threads"""
+        with self.lock:
+            if self.started:
+                return
+
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"{self.name}-worker-{i + 1}",
+                    daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+
+            self.started = True
+            logger.info(f"Started {self.workers} {self.name} worker(s), queue size {self.queue.maxsize}")
+
+    def submit(self, item: Any):
+        """
+        Queue an item for processing without blocking
+
+        Args:
+            item: Item to pass to the handler
+
+        Raises:
+            QueueFullError: If the queue is already at capacity
+        """
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            with self.lock:
+                self.rejected += 1
+            raise QueueFullError(f"{self.name} queue is full ({self.queue.maxsize} items waiting)")
+        
+        with self.lock:
+            self.submitted += 1
+
+    def qsize(self) -> int:
+        """Return the approximate number of items waiting in the queue"""
+        return self.queue.qsize()
+
+    def idle_capacity(self) -> int:
+        """Return how many more items could start running right away"""
+        with self.lock:
+            return max(0, self.workers - self.active - self.queue.qsize())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the pool's queue depth and counters
+        
+        Returns:
+            Dictionary of pool metrics
+        """
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "running": self.started,
+                "queue_depth": self.queue.qsize(),
+                "queue_capacity": self.queue.maxsize,
+                "active": self.active,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+    def _worker_loop(self):
+        """Worker thread body: block on the queue and run the handler"""
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+            
+            with self.lock:
+                self.active += 1
+            failed = False
+            try:
+                failed = self.handler(item) is False
+            except Exception as e:
+                failed = True
+                logger.error(f"Unhandled error in {self.name} worker: {e}")
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    if failed:
+                        self.failed += 1
+                    else:
+                        self.completed += 1
+                self.queue.task_done()
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop the workers after the queued items have been processed
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait forever
+
+        Returns:
+            True if all workers exited, False if the timeout was reached
+        """
+        with self.lock:
+            if not self.started:
+                return True
+            threads = list(self.threads)
+            self.started = False
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        # One sentinel per worker, queued behind any pending items so they drain first
+        for _ in threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                self.queue.put(_STOP, timeout=remaining)
+            except queue.Full:
+                logger.warning(f"Timed out queueing stop signal for {self.name} workers")
+                break
+
+        for thread in threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+
+        alive = [thread for thread in threads if thread.is_alive()]
+        with self.lock:
+            self.threads = alive
+
+        if alive:
+            logger.warning(f"{len(alive)} {self.name} worker(s) still running after shutdown timeout")
+            return False
+
+        logger.info(f"All {self.name} workers stopped")
+        return True
+
+
+class PipelineStage:
+    """
+    A named stage in a face's pipeline DAG
+
+    ``requires`` lists stages that must succeed before this stage can run;
+    if any of them fails the stage is skipped. ``after`` lists stages that
+    only have to finish first, whether they succeed or fail.
+    """
+
+    def __init__(self, name: str, requires: Optional[List[str]] = None, after: Optional[List[str]] = None):
+        self.name = name
+        self.requires = list(requires or [])
+        self.after = list(after or [])
+
+    @property
+    def dependencies(self) -> List[str]:
+        """All stages that must finish before this one can start"""
+        return self.requires + self.after
+
+
+class PipelineRun:
+    """
+    Tracks one face's progress through a DAG of pipeline stages
+
+    The run does not execute stages itself. Whenever a stage becomes ready it
+    calls ``dispatch(run, stage_name)``, and whoever executes the stage reports
+    back with ``stage_started`` and ``stage_finished``. Dependents are
+    dispatched the moment their last dependency finishes.
+    """
+
+    PENDING = "pending"
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    FINISHED_STATES = (SUCCEEDED, FAILED, SKIPPED)
+
+    def __init__(self, face_id: str, stages: List[PipelineStage],
+                 dispatch: Callable[["PipelineRun", str], None],
+                 on_stage_finished: Optional[Callable[["PipelineRun", str], None]] = None,
+                 on_complete: Optional[Callable[["PipelineRun"], None]] = None,
+                 context: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a run
+
+        Args:
+            face_id: Face ID this run processes
+            stages: Stages making up the DAG
+            dispatch: Callable that queues a ready stage for execution
+            on_stage_finished: Optional callback invoked after each stage finishes
+            on_complete: Optional callback invoked once every stage has finished
+            context: Extra data for the stage handlers (e.g. the image path)
+
+        Raises:
+            ValueError: If a dependency is unknown or the stages contain a cycle
+        """
+        self.face_id = face_id
+        self.stages = {stage.name: stage for stage in stages}
+        self.dispatch = dispatch
+        self.on_stage_finished = on_stage_finished
+        self.on_complete = on_complete
+        self.context = context or {}
+        self.lock = threading.Lock()
+        self.status = {name: self.PENDING for name in self.stages}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.completed = False
+
+        self._validate()
+
+    def _validate(self):
+        """Check that every dependency exists and the stages form a DAG"""
+        for stage in self.stages.values():
+            for dep in stage.dependencies:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm: if we can't order every stage there is a cycle
+        remaining = {name: set(stage.dependencies) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline stages contain a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def start(self):
+        """
+        Dispatch the stages that have no dependencies
+
+        Exceptions raised by dispatch (e.g. QueueFullError) propagate to the
+        caller so it can reject the whole run.
+        """
+        roots = [name for name, stage in self.stages.items() if not stage.dependencies]
+        for name in roots:
+            self._mark_queued(name)
+        for name in roots:
+            self.dispatch(self, name)
+
+    def stage_started(self, name: str):
+        """Record that a stage has started executing"""
+        with self.lock:
+            self.status[name] = self.RUNNING
+            timing = self.timings.setdefault(name, {})
+            timing["started_at"] = time.time()
+            if "queued_at" in timing:
+                timing["wait_seconds"] = round(timing["started_at"] - timing["queued_at"], 3)
+
+    def stage_finished(self, name: str, success: bool, error: Optional[str] = None):
+        """
+        Record a stage's outcome and dispatch any stages it unblocks
+
+        Args:
+            name: Stage name
+            success: Whether the stage succeeded
+            error: Optional error message for a failed stage
+        """
+        self._finish(name, self.SUCCEEDED if success else self.FAILED, error)
+        self._advance()
+
+    def _mark_queued(self, name: str):
+        """Record that a stage has been handed to dispatch"""
+        with self.lock:
+            self.status[name] = self.QUEUED
+            self.timings.setdefault(name, {})["queued_at"] = time.time()
+
+    def _finish(self, name: str, status: str, error: Optional[str] = None):
+        """Record a stage's final status and timing, then notify the callback"""
+        with self.lock:
+            self.status[name] = status
+            timing = self.timings.setdefault(name, {})
+            timing["status"] = status
+            timing["finished_at"] = time.time()
+            if "started_at" in timing:
+                timing["duration_seconds"] = round(timing["finished_at"] - timing["started_at"], 3)
+            if error:
+                timing["error"] = error
+
+        if self.on_stage_finished:
+            try:
+                self.on_stage_finished(self, name)
+            except Exception as e:
+                logger.error(f"Error in stage finished callback for {self.face_id}/{name}: {e}")
+
+    def _advance(self):
+        """Skip or dispatch every pending stage whose dependencies have all finished"""
+        while True:
+            to_skip = []
+            to_dispatch = []
+            with self.lock:
+                # Claim stages while holding the lock so concurrent finishers can't dispatch them twice
+                for name, stage in self.stages.items():
+                    if self.status[name] != self.PENDING:
+                        continue
+                    if any(self.status[dep] not in self.FINISHED_STATES for dep in stage.dependencies):
+                        continue
+                    if any(self.status[dep] != self.SUCCEEDED for dep in stage.requires):
+                        self.status[name] = self.SKIPPED
+                        to_skip.append(name)
+                    else:
+                        self.status[name] = self.QUEUED
+                        self.timings.setdefault(name, {})["queued_at"] = time.time()
+                        to_dispatch.append(name)
+
+            if not to_skip and not to_dispatch:
+                break
+
+            for name in to_skip:
+                self._finish(name, self.SKIPPED)
+
+            for name in to_dispatch:
+                try:
+                    self.dispatch(self, name)
+                except Exception as e:
+                    logger.error(f"Failed to dispatch stage {name} for {self.face_id}: {e}")
+                    self._finish(name, self.FAILED, str(e))
+
+        self._check_complete()
+
+    def _check_complete(self):
+        """Invoke on_complete exactly once after every stage has finished"""
+        with self.lock:
+            if self.completed:
+                return
+            if any(status not in self.FINISHED_STATES for status in self.status.values()):
+                return
+            self.completed = True
+
+        if self.on_complete:
+            try:
+                self.on_complete(self)
+            except Exception as e:
+                logger.error(f"Error in pipeline completion callback for {self.face_id}: {e}")
+
+    def succeeded(self, name: str) -> bool:
+        """Return True if the named stage finished successfully"""
+        with self.lock:
+            return self.status.get(name) == self.SUCCEEDED
+
+    def get_timings(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a JSON-serializable copy of the recorded stage timings
+
+        Args:
+            names: Optional list of stages to include (default: all)
+
+        Returns:
+            Dictionary of timing info keyed by stage name
+        """
+        with self.lock:
+            return {
+                name: dict(timing)
+                for name, timing in self.timings.items()
+                if names is None or name in names
+            }
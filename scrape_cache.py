@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+scrape_cache.py - Shared cache of Zyte and Firecrawl scrape results
+
+The same profile and news URLs come back from FaceCheckID for many faces.
+Scrape results are kept in the scrape_cache table keyed by scraper and
+normalized URL, so every worker reuses them until they expire. Each scraper
+has its own TTL; failed scrapes are cached too, with a shorter TTL, so a
+dead page isn't paid for on every face that links to it.
+
+Cache errors never fail a scrape: a lookup that can't reach the database
+counts as a miss and the page is scraped as usual.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import db_connector
+
+logger = logging.getLogger("ScrapeCache")
+
+SOURCE_ZYTE = "zyte"
+SOURCE_FIRECRAWL = "firecrawl"
+
+# Social profiles change more often than articles and pages
+DEFAULT_TTL_SECONDS = {
+    SOURCE_ZYTE: 24 * 3600,
+    SOURCE_FIRECRAWL: 7 * 24 * 3600,
+}
+DEFAULT_FAILURE_TTL_SECONDS = 3600
+
+
+class ScrapeCache:
+    """Read-through cache of scrape results with per-source and failure TTLs"""
+
+    def __init__(self, ttl_seconds: Optional[Dict[str, float]] = None,
+                 failure_ttl_seconds: float = DEFAULT_FAILURE_TTL_SECONDS, enabled: bool = True):
+        """
+        Initialize the cache
+
+        Args:
+            ttl_seconds: Seconds a successful scrape stays cached, by source
+            failure_ttl_seconds: Seconds a failed scrape stays cached (0 doesn't cache failures)
+            enabled: Whether to use the cache at all
+        """
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS)
+        self.ttl_seconds.update(ttl_seconds or {})
+        self.failure_ttl_seconds = float(failure_ttl_seconds)
+        self.enabled = enabled
+        self.lock = threading.Lock()
+
+        # Counters reported by stats()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def _count(self, counter: str):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def fetch(self, source: str, url_key: str, scrape: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for a URL, scraping and caching it on a miss
+
+        Args:
+            source: Scraper the result comes from (SOURCE_*)
+            url_key: Normalized URL
+            scrape: Called without arguments on a miss; returns the scraped
+                data, or None if the scrape failed
+
+        Returns:
+            Scraped data, or None if the scrape failed (now or when cached)
+        """
+        if not self.enabled or not url_key:
+            return scrape()
+
+        try:
+            entry = db_connector.get_scrape_cache_entry(source, url_key)
+        except Exception as e:
+            logger.warning(f"Scrape cache lookup failed for {url_key}: {e}")
+            self._count("errors")
+            entry = None
+
+        if entry is not None:
+            if entry["success"]:
+                self._count("hits")
+                logger.info(f"Using cached {source} scrape of {url_key}")
+                return entry["data"]
+            self._count("negative_hits")
+            logger.info(f"Skipping {source} scrape of {url_key}: it failed recently")
+            return None
+
+        self._count("misses")
+        data = scrape()
+
+        ttl_seconds = self.ttl_seconds.get(source, DEFAULT_TTL_SECONDS[SOURCE_FIRECRAWL]) if data else self.failure_ttl_seconds
+        if ttl_seconds > 0:
+            try:
+                db_connector.save_scrape_cache_entry(source, url_key, data, ttl_seconds)
+                self._count("stores")
+            except Exception as e:
+                logger.warning(f"Could not cache {source} scrape of {url_key}: {e}")
+                self._count("errors")
+
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss counters
+
+        Returns:
+            Dictionary of cache metrics
+        """
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "errors": self.errors
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure(ttl_seconds: Optional[Dict[str, float]] = None,
+              failure_ttl_seconds: float = DEFAULT_FAILURE_TTL_SECONDS, enabled: bool = True) -> ScrapeCache:
+    """
+    Replace the process-wide scrape cache
+
+    Args:
+        ttl_seconds: Seconds a successful scrape stays cached, by source
+        failure_ttl_seconds: Seconds a failed scrape stays cached
+        enabled: Whether to use the cache at all
+
+    Returns:
+        The new cache
+    """
+    global _cache
+
+    cache = ScrapeCache(ttl_seconds, failure_ttl_seconds, enabled)
+    with _cache_lock:
+        _cache = cache
+    return cache
+
+
+def get_cache() -> ScrapeCache:
+    """Return the process-wide scrape cache, creating a default one on first use"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScrapeCache()
+        return _cache
@@ -9,14 +9,36 @@ echo "
 ╚═════════════════════════════════════════════╝
 "
 
+# EYESPY_ROLE selects what this container runs:
+# - web:    HTTP server only (uploads are queued for separate workers)
+# - worker: pipeline worker only (no HTTP server)
+# - all:    HTTP server with the pipeline running in each web worker (default)
+export EYESPY_ROLE=${EYESPY_ROLE:-all}
+
+# Cloud Run instances don't share a disk, so images go to a GCS bucket there
+if [ -n "$K_SERVICE" ]; then
+    export BLOB_STORE_BACKEND=${BLOB_STORE_BACKEND:-gcs}
+    if [ "$BLOB_STORE_BACKEND" = "gcs" ] && [ -z "$BLOB_STORE_BUCKET" ]; then
+        echo "[STARTUP] BLOB_STORE_BUCKET must be set on Cloud Run (the bucket holding face images)"
+        exit 1
+    fi
+fi
+
+if [ "$EYESPY_ROLE" = "worker" ]; then
+    echo "[STARTUP] Starting pipeline worker..."
+    exec python worker.py
+fi
+
 # Get the PORT from environment variable or default to 8080
 export PORT=${PORT:-8080}
-echo "[STARTUP] Starting server on port $PORT..."
+echo "[STARTUP] Starting server on port $PORT (role: $EYESPY_ROLE)..."
 
 # Start the server using gunicorn
-# - workers: number of worker processes
+# - workers: number of worker processes (WEB_CONCURRENCY, default 2)
+# - worker-class/threads: threaded workers; event streams hold a thread each and are capped at
+#   EVENTS_MAX_STREAMS per worker (default 4) so the other threads stay free for uploads and polls
 # - timeout: increased timeout for longer requests (background processing happens in threads)
 # - bind: host:port to bind to
-# - preload: load the application once first to initialize the controller
+# - preload: load the application once first; the controller is initialized lazily in each worker
 # - backend_server:app - module:variable that contains the Flask application
-exec gunicorn --workers=2 --timeout=180 --bind=0.0.0.0:$PORT --preload backend_server:app
\ No newline at end of file
+exec gunicorn --workers=${WEB_CONCURRENCY:-2} --worker-class=gthread --threads=${WEB_THREADS:-8} --timeout=180 --bind=0.0.0.0:$PORT --preload backend_server:app
\ No newline at end of file
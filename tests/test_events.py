@@ -0,0 +1,42 @@
+import pytest
+
+from events import EVENT_PROGRESS, EventBus, SubscriberLimitError, make_event
+
+
+def test_events_reach_only_their_face_subscribers():
+    bus = EventBus()
+    mine = bus.subscribe("face_1")
+    other = bus.subscribe("face_2")
+
+    bus.publish(make_event("face_1", EVENT_PROGRESS, progress=50))
+
+    assert mine.get(timeout=1)["progress"] == 50
+    assert other.get(timeout=0) is None
+
+
+def test_slow_subscriber_loses_its_oldest_events():
+    bus = EventBus()
+    subscription = bus.subscribe("face_1", max_queue_size=2)
+    for progress in (10, 20, 30):
+        bus.publish(make_event("face_1", EVENT_PROGRESS, progress=progress))
+
+    assert [subscription.get(timeout=0)["progress"] for _ in range(2)] == [20, 30]
+    assert subscription.dropped == 1
+
+
+def test_subscriptions_past_the_limit_are_rejected():
+    bus = EventBus()
+    first = bus.subscribe("face_1", max_subscribers=2)
+    bus.subscribe("face_2", max_subscribers=2)
+
+    with pytest.raises(SubscriberLimitError):
+        bus.subscribe("face_3", max_subscribers=2)
+
+    # Unsubscribing twice frees only one slot
+    bus.unsubscribe(first)
+    bus.unsubscribe(first)
+    bus.subscribe("face_3", max_subscribers=2)
+    with pytest.raises(SubscriberLimitError):
+        bus.subscribe("face_4", max_subscribers=2)
+
+    assert bus.stats() == {"faces": 2, "subscribers": 2, "published": 0, "rejected": 2}
@@ -0,0 +1,169 @@
+import threading
+import time
+
+import pytest
+
+# FaceUpload needs its runtime dependencies (dotenv, openai, psycopg2) to import
+FaceUpload = pytest.importorskip("FaceUpload")
+
+
+@pytest.fixture
+def poll_settings(monkeypatch):
+    monkeypatch.setattr(FaceUpload, "POLL_MIN_SECONDS", 1.0)
+    monkeypatch.setattr(FaceUpload, "POLL_MAX_SECONDS", 8.0)
+    monkeypatch.setattr(FaceUpload, "POLL_JITTER", 0.0)
+
+
+def test_next_poll_delay_starts_at_the_minimum(poll_settings):
+    assert FaceUpload.next_poll_delay(None, 0, 0) == 1.0
+
+
+def test_next_poll_delay_backs_off_while_progress_stalls(poll_settings):
+    delays = []
+    delay = 1.0
+    for _ in range(5):
+        delay = FaceUpload.next_poll_delay(delay, 40, 40)
+        delays.append(delay)
+    assert delays == [2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_next_poll_delay_resets_when_progress_moves(poll_settings):
+    assert FaceUpload.next_poll_delay(8.0, 50, 40) == 1.0
+
+
+def test_next_poll_delay_stays_short_near_the_end(poll_settings):
+    assert FaceUpload.next_poll_delay(8.0, 95, 95) == 2.0
+
+
+def test_next_poll_delay_applies_jitter(poll_settings, monkeypatch):
+    monkeypatch.setattr(FaceUpload, "POLL_JITTER", 0.2)
+    for _ in range(100):
+        assert 3.2 <= FaceUpload.next_poll_delay(2.0, 10, 10) <= 4.8
+
+
+@pytest.fixture
+def scraped(monkeypatch):
+    """Replace scrape_url with a fake that records the URLs it is asked for"""
+    calls = []
+
+    def fake_scrape_url(url, deadline=None):
+        calls.append(url)
+        return None if "fail" in url else {"source_url": url}
+
+    monkeypatch.setattr(FaceUpload, "scrape_url", fake_scrape_url)
+    return calls
+
+
+def test_scrape_plan_fetches_nothing_after_its_deadline(scraped):
+    plan = FaceUpload.ScrapePlan(max_scrapes=10, deadline=time.monotonic() - 1)
+
+    assert plan.scrape("https://example.com/a") is None
+    assert scraped == []
+
+
+def test_scrape_url_starts_no_paid_request_after_its_deadline(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(FaceUpload.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(FaceUpload, "ZYTE_AVAILABLE", True)
+    monkeypatch.setattr(FaceUpload, "FIRECRAWL_AVAILABLE", True)
+    monkeypatch.setattr(FaceUpload, "FIRECRAWL_API_KEY", "key")
+    uncached = FaceUpload.scrape_cache.ScrapeCache(enabled=False)
+    monkeypatch.setattr(FaceUpload.scrape_cache, "get_cache", lambda: uncached)
+    fetched = []
+
+    def slow_failed_zyte(url):
+        fetched.append("zyte")
+        clock[0] += 60
+        return None
+
+    def firecrawl(url):
+        fetched.append("firecrawl")
+        return {"source_url": url}
+
+    monkeypatch.setattr(FaceUpload, "scrape_with_zyte", slow_failed_zyte)
+    monkeypatch.setattr(FaceUpload, "_fetch_with_firecrawl", firecrawl)
+
+    # Zyte overruns the deadline, so the Firecrawl fallback is never started
+    assert FaceUpload.scrape_url("https://www.instagram.com/someone", deadline=130.0) is None
+    assert fetched == ["zyte"]
+
+    # Without a deadline the same failure falls back to Firecrawl
+    fetched.clear()
+    assert FaceUpload.scrape_url("https://www.instagram.com/someone") is not None
+    assert fetched == ["zyte", "firecrawl"]
+
+
+def test_scrape_plan_scrapes_each_url_once(scraped):
+    plan = FaceUpload.ScrapePlan(max_scrapes=10)
+
+    first = plan.scrape("https://example.com/profile")
+    again = plan.scrape("https://EXAMPLE.com/profile/#bio")
+    assert first == again == {"source_url": "https://example.com/profile"}
+    assert again is not first
+
+    # Failures are shared too
+    assert plan.scrape("https://example.com/fail") is None
+    assert plan.scrape("https://example.com/fail/") is None
+
+    assert scraped == ["https://example.com/profile", "https://example.com/fail"]
+    assert plan.stats() == {"scrapes": 2, "reused": 2, "skipped": 0}
+
+
+def test_scrape_plan_stops_at_its_budget(scraped):
+    plan = FaceUpload.ScrapePlan(max_scrapes=2)
+
+    assert plan.scrape("https://example.com/a") is not None
+    assert plan.scrape("https://example.com/b") is not None
+    assert plan.scrape("https://example.com/c") is None
+    # Already scraped URLs are still reused past the budget
+    assert plan.scrape("https://example.com/a") is not None
+
+    assert scraped == ["https://example.com/a", "https://example.com/b"]
+    assert plan.stats() == {"scrapes": 2, "reused": 1, "skipped": 1}
+
+
+def test_scrape_plan_reserves_budget_for_primaries(scraped):
+    plan = FaceUpload.ScrapePlan(
+        max_scrapes=3, primary_urls=["https://example.com/primary-1", "https://example.com/primary-2"]
+    )
+
+    # One slot is left over for fallbacks
+    assert plan.scrape("https://example.com/fallback-1") is not None
+    assert plan.scrape("https://example.com/fallback-2") is None
+
+    # A primary reached as another result's fallback uses its own reserved slot
+    assert plan.scrape("https://example.com/primary-2") is not None
+    assert plan.scrape("https://example.com/primary-1") is not None
+
+    assert scraped == [
+        "https://example.com/fallback-1", "https://example.com/primary-2", "https://example.com/primary-1"
+    ]
+
+
+def test_scrape_plan_shares_a_concurrent_scrape(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_scrape_url(url, deadline=None):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return {"source_url": url}
+
+    monkeypatch.setattr(FaceUpload, "scrape_url", slow_scrape_url)
+    plan = FaceUpload.ScrapePlan(max_scrapes=10)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(plan.scrape("https://example.com/a")))
+               for _ in range(3)]
+
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["https://example.com/a"]
+    assert results == [{"source_url": "https://example.com/a"}] * 3
@@ -0,0 +1,42 @@
+import uuid
+
+import ids
+
+
+def test_uuid7_sets_version_and_variant():
+    value = ids.uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_values_are_unique_and_ordered():
+    values = [ids.uuid7() for _ in range(5000)]
+    assert len(set(values)) == len(values)
+    assert values == sorted(values)
+
+
+def test_uuid7_keeps_order_within_one_millisecond(monkeypatch):
+    now_ns = 1_700_000_000_000 * 1_000_000
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now_ns)
+
+    values = [ids.uuid7() for _ in range(100)]
+    assert values == sorted(values)
+    assert {value.int >> 80 for value in values} == {now_ns // 1_000_000}
+
+
+def test_uuid7_keeps_order_when_the_clock_steps_back(monkeypatch):
+    clock = [1_700_000_000_000 * 1_000_000]
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: clock[0])
+
+    first = ids.uuid7()
+    clock[0] -= 5_000 * 1_000_000
+    second = ids.uuid7()
+    assert second > first
+
+
+def test_new_face_id_is_prefixed_uuid7():
+    face_id = ids.new_face_id()
+    assert face_id.startswith(ids.FACE_ID_PREFIX)
+    assert uuid.UUID(face_id[len(ids.FACE_ID_PREFIX):]).version == 7
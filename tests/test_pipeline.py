@@ -0,0 +1,179 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import PipelineRun, PipelineStage, QueueFullError, StagePool
+
+
+def _wait_until(predicate, timeout=5.0):
+    """Poll predicate until it is true or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_stage_pool_runs_submitted_items():
+    seen = []
+    pool = StagePool("test", seen.append, workers=2, max_queue_size=10)
+    pool.start()
+    for i in range(5):
+        pool.submit(i)
+
+    assert pool.shutdown(timeout=5)
+    assert sorted(seen) == [0, 1, 2, 3, 4]
+    stats = pool.stats()
+    assert stats["submitted"] == 5
+    assert stats["completed"] == 5
+    assert stats["queue_depth"] == 0
+
+
+def test_stage_pool_rejects_when_queue_is_full():
+    release = threading.Event()
+    pool = StagePool("test", lambda item: release.wait(5), workers=1, max_queue_size=1)
+    pool.start()
+    try:
+        pool.submit("running")
+        assert _wait_until(lambda: pool.stats()["active"] == 1)
+        pool.submit("waiting")
+
+        with pytest.raises(QueueFullError):
+            pool.submit("rejected")
+        assert pool.stats()["rejected"] == 1
+        assert pool.idle_capacity() == 0
+    finally:
+        release.set()
+        assert pool.shutdown(timeout=5)
+
+
+def test_stage_pool_shutdown_drains_queued_items():
+    seen = []
+    release = threading.Event()
+
+    def handler(item):
+        release.wait(5)
+        seen.append(item)
+
+    pool = StagePool("test", handler, workers=1, max_queue_size=10)
+    pool.start()
+    for i in range(3):
+        pool.submit(i)
+    release.set()
+
+    assert pool.shutdown(timeout=5)
+    assert seen == [0, 1, 2]
+
+
+def test_stage_pool_counts_failed_items():
+    def handler(item):
+        if item == "raise":
+            raise RuntimeError("boom")
+        return item != "fail"
+
+    pool = StagePool("test", handler, workers=1, max_queue_size=10)
+    pool.start()
+    for item in ("ok", "fail", "raise", "ok"):
+        pool.submit(item)
+
+    assert pool.shutdown(timeout=5)
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["failed"] == 2
+
+
+def test_stage_pool_reports_idle_capacity():
+    release = threading.Event()
+    pool = StagePool("test", lambda item: release.wait(5), workers=3, max_queue_size=10)
+    pool.start()
+    try:
+        assert pool.idle_capacity() == 3
+        pool.submit("busy")
+        assert _wait_until(lambda: pool.idle_capacity() == 2)
+    finally:
+        release.set()
+        assert pool.shutdown(timeout=5)
+
+
+def _stages():
+    """face_search -> records -> bio, with bio also waiting on records whatever its outcome"""
+    return [
+        PipelineStage("face_search"),
+        PipelineStage("records", requires=["face_search"]),
+        PipelineStage("bio", requires=["face_search"], after=["records"]),
+    ]
+
+
+def test_pipeline_run_dispatches_stages_in_dependency_order():
+    dispatched = []
+    completed = []
+    run = PipelineRun("face_1", _stages(), lambda run, stage: dispatched.append(stage),
+                      on_complete=completed.append)
+
+    run.start()
+    assert dispatched == ["face_search"]
+
+    run.stage_started("face_search")
+    run.stage_finished("face_search", True)
+    assert dispatched == ["face_search", "records"]
+
+    run.stage_started("records")
+    run.stage_finished("records", False, "no records")
+    assert dispatched == ["face_search", "records", "bio"]
+    assert completed == []
+
+    run.stage_started("bio")
+    run.stage_finished("bio", True)
+    assert completed == [run]
+    assert run.status == {"face_search": "succeeded", "records": "failed", "bio": "succeeded"}
+
+    timings = run.get_timings()
+    assert timings["records"]["error"] == "no records"
+    assert "duration_seconds" in timings["bio"]
+
+
+def test_pipeline_run_skips_stages_whose_requirements_failed():
+    dispatched = []
+    completed = []
+    run = PipelineRun("face_1", _stages(), lambda run, stage: dispatched.append(stage),
+                      on_complete=completed.append)
+
+    run.start()
+    run.stage_started("face_search")
+    run.stage_finished("face_search", False)
+
+    assert dispatched == ["face_search"]
+    assert run.status == {"face_search": "failed", "records": "skipped", "bio": "skipped"}
+    assert completed == [run]
+
+
+def test_pipeline_run_fails_stage_that_cannot_be_dispatched():
+    def dispatch(run, stage):
+        if stage == "records":
+            raise QueueFullError("records queue is full")
+
+    run = PipelineRun("face_1", _stages(), dispatch)
+    run.start()
+    run.stage_finished("face_search", True)
+
+    assert run.status["records"] == "failed"
+    assert run.get_timings(["records"])["records"]["error"] == "records queue is full"
+    # bio only needs records to finish, not to succeed
+    assert run.status["bio"] == "queued"
+
+
+def test_pipeline_run_rejects_cycles():
+    stages = [
+        PipelineStage("a", requires=["c"]),
+        PipelineStage("b", requires=["a"]),
+        PipelineStage("c", after=["b"]),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineRun("face_1", stages, lambda run, stage: None)
+
+
+def test_pipeline_run_rejects_unknown_dependencies():
+    with pytest.raises(ValueError, match="unknown stage"):
+        PipelineRun("face_1", [PipelineStage("bio", requires=["records"])], lambda run, stage: None)
@@ -0,0 +1,61 @@
+from ttl_cache import TTLCache
+
+
+def test_get_returns_stored_value_or_default():
+    cache = TTLCache(max_entries=4, ttl_seconds=60)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=4, ttl_seconds=10)
+    cache.put("a", 1)
+
+    now[0] += 9.9
+    assert cache.get("a") == 1
+    now[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_and_clear_drop_entries():
+    cache = TTLCache(max_entries=4, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+
+    cache.invalidate("a", "missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_zero_size_or_ttl_disables_the_cache():
+    for cache in (TTLCache(max_entries=0, ttl_seconds=60), TTLCache(max_entries=4, ttl_seconds=0)):
+        assert not cache.enabled
+        cache.put("a", 1)
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
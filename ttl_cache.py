@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ttl_cache.py - Thread-safe in-process LRU cache whose entries expire
+
+Used to keep recently written per-face data in memory so the pipeline
+stages that read it back shortly afterwards don't go to the database.
+The cache is per process; entries expire after the TTL so a write made by
+another process is picked up within that time.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache bounded by entry count, with a time-to-live for each entry"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Most entries kept; the least recently used is evicted
+                first. 0 disables the cache.
+            ttl_seconds: Seconds an entry stays valid after it is stored
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        # Counters reported by stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry
+
+        Args:
+            key: Entry key
+            default: Returned when the key is missing or expired
+
+        Returns:
+            The cached value, or default
+        """
+        if not self.enabled:
+            return default
+
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store an entry, evicting the least recently used ones if the cache is full"""
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        """Drop entries if present"""
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit/miss counters
+
+        Returns:
+            Dictionary of cache metrics
+        """
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
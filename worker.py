@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+worker.py - Standalone pipeline worker for the EyeSpy system
+
+Runs the controller pipeline (face search, records and bio) against the
+shared Postgres job queue without serving HTTP. The web tier
+(backend_server.py with EYESPY_ROLE=web) only accepts uploads and serves
+status, so the two sides can be scaled with their own process counts.
+"""
+
+import os
+import sys
+import signal
+import logging
+import threading
+import argparse
+
+import controller
+
+logger = logging.getLogger("Worker")
+
+
+def main():
+    """Main function to start a pipeline worker"""
+    # Print banner
+    print("""
+    ╔═════════════════════════════════════════════╗
+    ║          EYE SPY PIPELINE WORKER            ║
+    ║       Face Processing & Identity Search     ║
+    ╚═════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description='Run EyeSpy pipeline workers against the shared job queue')
+    parser.add_argument('--token', help='FaceCheckID API token (overrides .env file)')
+    parser.add_argument('--firecrawl-key', help='Firecrawl API key (overrides .env file)')
+    parser.add_argument('--face-workers', type=int, help='Number of face search worker threads')
+    parser.add_argument('--records-workers', type=int, help='Number of record checking worker threads')
+    parser.add_argument('--bio-workers', type=int, help='Number of bio generation worker threads')
+    args = parser.parse_args()
+    
+    # Apply command line overrides BEFORE the controller reloads its configuration
+    overrides = {
+        'FACECHECK_API_TOKEN': args.token,
+        'FIRECRAWL_API_KEY': args.firecrawl_key,
+        'PIPELINE_WORKERS': args.face_workers,
+        'RECORDS_WORKERS': args.records_workers,
+        'BIO_WORKERS': args.bio_workers,
+    }
+    for key, value in overrides.items():
+        if value is not None:
+            os.environ[key] = str(value)
+            print(f"Set {key} from command line")
+    os.environ['EYESPY_ROLE'] = 'worker'
+    
+    if not controller.initialize(reload_config=True, start_workers=True):
+        print("Failed to initialize controller, exiting")
+        sys.exit(1)
+    logger.info(
+        f"Pipeline worker started (role={controller.get_config('EYESPY_ROLE')}, "
+        f"face search workers={controller.get_config('PIPELINE_WORKERS')}, "
+        f"records workers={controller.get_config('RECORDS_WORKERS')}, "
+        f"bio workers={controller.get_config('BIO_WORKERS')})"
+    )
+    
+    # Block the main thread until we're asked to stop; the pipeline runs on worker threads
+    stop_requested = threading.Event()
+    
+    def signal_handler(sig, frame):
+        print("\nShutting down EyeSpy worker...")
+        stop_requested.set()
+    
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    print("[WORKER] Waiting for jobs...")
+    stop_requested.wait()
+    
+    controller.shutdown()
+
+
+if __name__ == "__main__":
+    main()